@@ -1,8 +1,55 @@
-import pygame
-from src.game import Game
+import argparse
+import os
+
+from src.profiling import StartupProfile
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Autonomous Weapons Simulation")
+    parser.add_argument("--profile-startup", nargs="?", const="startup_profile.json", default=None, metavar="PATH",
+                        help="time each startup phase, write a JSON report to PATH ('-' for stdout) and exit")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="record every frame and write the trace to PATH when the game quits (.csv or .json)")
+    parser.add_argument("--telemetry", default=None, metavar="DIR",
+                        help="log the player's decisions to JSON Lines files in DIR")
+    args = parser.parse_args(argv)
+    if args.profile_startup == "-":
+        # keep stdout clean for the report
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+    # the game is imported here so the startup profile can time the imports
+    profile = StartupProfile()
+    import pygame
+    profile.mark("import pygame")
+    import src.utils
+    profile.mark("import src.utils")
+    import src.sprites
+    profile.mark("import src.sprites")
+    from src.game import Game
+    from src.settings import Settings
+    from src.telemetry import TelemetryWriter
+    profile.mark("import src.game")
 
-if __name__ == "__main__":
     pygame.init()
-    game = Game()
-    game.run()
+    profile.mark("pygame.init")
+    telemetry = None
+    telemetry_dir = args.telemetry or Settings.telemetry_dir
+    if telemetry_dir and not args.profile_startup:
+        telemetry = TelemetryWriter(telemetry_dir)
+    game = Game(profile, telemetry)
+
+    if args.profile_startup:
+        from src.fonts import fonts
+        profile.info["fonts"] = fonts.metrics()
+        profile.write(args.profile_startup)
+    else:
+        if args.trace:
+            game.profiler.enable_trace()
+        game.run()
+        if args.trace:
+            game.profiler.write_trace(args.trace)
+    if telemetry is not None:
+        telemetry.close()
     pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+# src/analytics.py
+#
+# Offline analysis of session telemetry logs (src/telemetry.py). Two passes,
+# both out of core:
+#
+#   python -m src.analytics ingest logs/ --output table/ --workers 8
+#   python -m src.analytics report table/ --workers 8 --output report.json
+#
+# ingest streams the JSON Lines files line by line and appends the 1v1
+# rounds and the final results to columnar part directories, one per group
+# of files, on a process pool. report memory-maps every part on the pool,
+# walks it in chunks and reduces it to counts, which are merged into: the
+# rate at which players use AWs against each opponent persona, that rate
+# round by round, and the distribution of the 1v1 result payoffs.
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.columnar import ColumnReader, ColumnWriter
+from src.engine import Engine
+from src.opponents import opponents
+from src.parallel import default_workers
+from src.strategies import get_strategy
+from src.tournament import damage_table
+
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_BINS = 50
+
+# persona of every opponent id, from the game's opponent list
+PERSONAS = {opponent["id"]: opponent["type"] for opponent in opponents}
+
+ROUND_DTYPES = {"opponent": np.int16, "match": np.int16, "round": np.int16,
+                "player_choice": np.uint8, "computer_choice": np.uint8}
+RESULT_DTYPES = {"payoff": np.float64, "lives_lost": np.int32, "resources_lost": np.int32}
+
+def log_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "*.jsonl"), recursive=True)))
+        else:
+            files.append(path)
+    return files
+
+# the log files split into at most num_parts groups of about the same size
+def group_files(files, num_parts):
+    groups = [[] for _ in range(max(1, min(num_parts, len(files))))]
+    sizes = [0] * len(groups)
+    for path in sorted(files, key=os.path.getsize, reverse=True):
+        smallest = sizes.index(min(sizes))
+        groups[smallest].append(path)
+        sizes[smallest] += os.path.getsize(path)
+    return [group for group in groups if group]
+
+class _TableBuffer:
+    def __init__(self, directory, dtypes, chunk_size):
+        self.writer = ColumnWriter(directory)
+        self.dtypes = dtypes
+        self.chunk_size = chunk_size
+        self.rows = {name: [] for name in dtypes}
+        self.count = 0
+
+    def add(self, event):
+        # look every field up first so a bad event leaves the columns aligned
+        row = [event[name] for name in self.rows]
+        for values, value in zip(self.rows.values(), row):
+            values.append(value)
+        self.count += 1
+        if self.count >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.count:
+            self.writer.append({name: np.array(values, dtype=self.dtypes[name]) for name, values in self.rows.items()})
+            self.rows = {name: [] for name in self.dtypes}
+            self.count = 0
+
+    def close(self):
+        self.flush()
+        if self.writer.columns is None:
+            # keep the schema complete for a part without any rows
+            self.writer.append({name: np.empty(0, dtype=dtype) for name, dtype in self.dtypes.items()})
+        self.writer.close()
+
+# convert one group of log files into the part directory; returns
+# (lines read, lines skipped as malformed)
+def ingest_part(files, directory, chunk_size=DEFAULT_CHUNK_SIZE):
+    rounds = _TableBuffer(os.path.join(directory, "rounds"), ROUND_DTYPES, chunk_size)
+    results = _TableBuffer(os.path.join(directory, "results"), RESULT_DTYPES, chunk_size)
+    lines = skipped = 0
+    for path in files:
+        with open(path, "rb") as log:
+            for line in log:
+                lines += 1
+                try:
+                    event = json.loads(line)
+                    if event["event"] == "round":
+                        rounds.add(event)
+                    elif event["event"] == "result":
+                        results.add(event)
+                except (ValueError, KeyError, TypeError):
+                    # e.g. the last line of a log cut short by a power loss
+                    skipped += 1
+    rounds.close()
+    results.close()
+    return lines, skipped
+
+def _ingest_part_job(job):
+    return ingest_part(*job)
+
+def ingest(paths, output, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    files = log_files(paths)
+    if not files:
+        raise ValueError("No telemetry logs to ingest")
+    if part_directories(output):
+        raise ValueError(f"{output!r} already holds ingested parts")
+    workers = workers or default_workers()
+    groups = group_files(files, workers)
+    jobs = [(group, os.path.join(output, f"part-{i:04d}"), chunk_size) for i, group in enumerate(groups)]
+
+    if workers == 1 or len(jobs) == 1:
+        counts = [_ingest_part_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(_ingest_part_job, jobs))
+    return len(files), sum(count[0] for count in counts), sum(count[1] for count in counts)
+
+def part_directories(table):
+    return sorted(glob.glob(os.path.join(table, "part-*")))
+
+# (edges,) of the result histogram: the lowest to the highest payoff a
+# session of num_matches matches can reach
+def payoff_edges(engine=None, num_matches=5, bins=DEFAULT_BINS):
+    engine = engine or Engine()
+    table = damage_table(engine)
+    per_round = engine.life_weight * table[:, 0] + engine.resource_weight * table[:, 1]
+    rounds = num_matches * engine.num_rounds
+    return np.linspace(rounds * per_round.min(), rounds * per_round.max(), bins + 1)
+
+# counts of one part, read chunk by chunk from its memory-mapped columns
+def summarize_part(directory, edges, chunk_size=DEFAULT_CHUNK_SIZE):
+    rounds = ColumnReader(os.path.join(directory, "rounds"))
+    results = ColumnReader(os.path.join(directory, "results"))
+
+    # (opponents, rounds) rounds played and rounds where the player used AWs
+    played = np.zeros((0, 0), dtype=np.int64)
+    used = np.zeros((0, 0), dtype=np.int64)
+    for chunk in rounds.chunks(chunk_size, ["opponent", "round", "player_choice"]):
+        opponent = chunk["opponent"].astype(np.intp)
+        round_index = chunk["round"].astype(np.intp)
+        shape = (int(opponent.max()) + 1, int(round_index.max()) + 1)
+        cell = np.ravel_multi_index((opponent, round_index), shape)
+        size = shape[0] * shape[1]
+        played = _add(played, np.bincount(cell, minlength=size).reshape(shape))
+        used = _add(used, np.bincount(cell, weights=chunk["player_choice"] != 0, minlength=size).astype(np.int64).reshape(shape))
+
+    histogram = np.zeros(len(edges) - 1, dtype=np.int64)
+    count, total, squares = 0, 0.0, 0.0
+    low, high = np.inf, -np.inf
+    for chunk in results.chunks(chunk_size, ["payoff"]):
+        payoff = np.asarray(chunk["payoff"])
+        # values outside the edges land in the first or last bin
+        bins = np.clip(np.searchsorted(edges, payoff, side="right") - 1, 0, len(histogram) - 1)
+        histogram += np.bincount(bins, minlength=len(histogram))
+        count += len(payoff)
+        total += float(payoff.sum())
+        squares += float(np.square(payoff).sum())
+        low, high = min(low, float(payoff.min())), max(high, float(payoff.max()))
+
+    return {"played": played, "used": used, "histogram": histogram, "count": count,
+            "sum": total, "squares": squares, "min": low, "max": high}
+
+def _summarize_part_job(job):
+    return summarize_part(*job)
+
+# a + b for count matrices of different shapes, padded with zeros
+def _add(a, b):
+    shape = tuple(max(x, y) for x, y in zip(a.shape, b.shape))
+    total = np.zeros(shape, dtype=np.int64)
+    total[:a.shape[0], :a.shape[1]] += a
+    total[:b.shape[0], :b.shape[1]] += b
+    return total
+
+# approximate percentile of a histogram, interpolated inside the bin
+def histogram_percentile(edges, histogram, q):
+    total = histogram.sum()
+    if total == 0:
+        return None
+    cumulative = np.cumsum(histogram)
+    target = q / 100 * total
+    i = int(np.searchsorted(cumulative, target))
+    i = min(i, len(histogram) - 1)
+    before = cumulative[i] - histogram[i]
+    fraction = (target - before) / histogram[i] if histogram[i] else 0.0
+    return float(edges[i] + fraction * (edges[i + 1] - edges[i]))
+
+def report(table, workers=None, edges=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    parts = part_directories(table)
+    if not parts:
+        raise ValueError(f"No ingested parts in {table!r}")
+    edges = payoff_edges() if edges is None else np.asarray(edges, dtype=np.float64)
+    workers = workers or default_workers()
+    jobs = [(part, edges, chunk_size) for part in parts]
+
+    if workers == 1 or len(jobs) == 1:
+        summaries = [_summarize_part_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(_summarize_part_job, jobs))
+
+    played = np.zeros((0, 0), dtype=np.int64)
+    used = np.zeros((0, 0), dtype=np.int64)
+    histogram = np.zeros(len(edges) - 1, dtype=np.int64)
+    for summary in summaries:
+        played = _add(played, summary["played"])
+        used = _add(used, summary["used"])
+        histogram += summary["histogram"]
+    count = sum(summary["count"] for summary in summaries)
+    total = sum(summary["sum"] for summary in summaries)
+    squares = sum(summary["squares"] for summary in summaries)
+
+    opponents = {}
+    for opponent in np.flatnonzero(played.sum(axis=1)):
+        rounds, uses = played[opponent], used[opponent]
+        opponents[int(opponent)] = {
+            "persona": PERSONAS.get(int(opponent), get_strategy(int(opponent)).label),
+            "strategy": get_strategy(int(opponent)).name,
+            "rounds": int(rounds.sum()),
+            "use_rate": float(uses.sum() / rounds.sum()),
+            # None where no session got that far
+            "use_rate_by_round": [float(u / r) if r else None for u, r in zip(uses, rounds)],
+        }
+
+    mean = total / count if count else None
+    payoff = {
+        "sessions": count,
+        "mean": mean,
+        "std": float(np.sqrt(max(squares / count - mean * mean, 0.0))) if count else None,
+        "min": min(summary["min"] for summary in summaries) if count else None,
+        "max": max(summary["max"] for summary in summaries) if count else None,
+        "p50": histogram_percentile(edges, histogram, 50),
+        "p90": histogram_percentile(edges, histogram, 90),
+        "edges": edges.tolist(),
+        "histogram": histogram.tolist(),
+    }
+    return {"parts": len(parts), "opponents": opponents, "payoff": payoff}
+
+def print_report(result, output=sys.stdout):
+    for opponent, summary in result["opponents"].items():
+        curve = " ".join("-" if rate is None else f"{rate:.2f}" for rate in summary["use_rate_by_round"])
+        print(f"{summary['persona']:<26}{summary['rounds']:>10} rounds  use AWs {summary['use_rate']:.1%}  by round: {curve}",
+              file=output)
+    payoff = result["payoff"]
+    if payoff["sessions"]:
+        print(f"result payoff over {payoff['sessions']} sessions: mean {payoff['mean']:.1f}, std {payoff['std']:.1f}, "
+              f"p50 ~{payoff['p50']:.1f}, p90 ~{payoff['p90']:.1f}, min {payoff['min']:.1f}, max {payoff['max']:.1f}",
+              file=output)
+
+def run_ingest(args):
+    start = time.perf_counter()
+    files, lines, skipped = ingest(args.logs, args.output, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"ingest: {files} files, {lines} lines ({skipped} skipped) in {elapsed:.3f}s", file=sys.stderr)
+
+def run_report(args):
+    start = time.perf_counter()
+    result = report(args.table, args.workers, payoff_edges(bins=args.bins), args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print_report(result)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+    print(f"report: {result['parts']} parts in {elapsed:.3f}s", file=sys.stderr)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.analytics", description="Session telemetry analytics.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_command = commands.add_parser("ingest", help="convert JSON Lines logs into columnar parts")
+    ingest_command.add_argument("logs", nargs="+", help="log files or directories of them")
+    ingest_command.add_argument("--output", required=True, help="directory for the columnar parts")
+    ingest_command.set_defaults(run=run_ingest)
+
+    report_command = commands.add_parser("report", help="aggregate the columnar parts")
+    report_command.add_argument("table", help="directory written by ingest")
+    report_command.add_argument("--bins", type=int, default=DEFAULT_BINS, help="bins of the payoff histogram")
+    report_command.add_argument("--output", default=None, help="write the report as JSON")
+    report_command.set_defaults(run=run_report)
+
+    for command in (ingest_command, report_command):
+        command.add_argument("--workers", type=int, default=default_workers(), help="worker processes")
+        command.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1 or getattr(args, "bins", 1) < 1:
+        raise SystemExit("--workers, --chunk-size and --bins must be at least 1")
+    try:
+        args.run(args)
+    except ValueError as error:
+        raise SystemExit(str(error))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# src/assets.py
+#
+# Lazy, cached image loading. Nothing is read from disk until an image is
+# first used, every (name, size) variant is scaled once, and once a display
+# exists the variants are converted to its pixel format so blits don't pay
+# for the conversion. Optionally the variants of one size are packed into a
+# single atlas surface and handed out as subsurfaces.
+import os
+
+import pygame
+
+IMAGE_DIR = os.path.join("assets", "images")
+
+class AssetManager:
+    def __init__(self, directory=IMAGE_DIR):
+        self.directory = directory
+        # name -> surface as loaded from disk
+        self.originals = {}
+        # (name, size) -> scaled surface, size None keeps the original size
+        self.variants = {}
+        # variants that still need convert_alpha once a display exists
+        self.unconverted = set()
+        self.atlases = {}
+        self.loads = 0
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    # the image as stored on disk, loaded on first use
+    def load(self, name):
+        image = self.originals.get(name)
+        if image is None:
+            image = pygame.image.load(self.path(name))
+            self.originals[name] = image
+            self.loads += 1
+        return image
+
+    # the image scaled to size (w, h), ready to blit
+    def image(self, name, size=None):
+        key = (name, None if size is None else (int(size[0]), int(size[1])))
+        image = self.variants.get(key)
+        if image is None:
+            image = self.load(name)
+            if key[1] is not None and image.get_size() != key[1]:
+                image = pygame.transform.scale(image, key[1])
+            self.variants[key] = image
+            self.unconverted.add(key)
+
+        if key in self.unconverted and pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+            self.variants[key] = image
+            self.unconverted.discard(key)
+        return image
+
+    # load and scale ahead of time, e.g. while an intro screen is showing
+    def preload(self, names, size=None):
+        for name in names:
+            self.image(name, size)
+
+    # Pack the size variants of names into one surface side by side; the
+    # variants become subsurfaces of it. Needs a display for convert_alpha.
+    def build_atlas(self, names, size):
+        size = (int(size[0]), int(size[1]))
+        images = [self.image(name, size) for name in names]
+        atlas = pygame.Surface((size[0] * len(images), size[1]), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        for i, image in enumerate(images):
+            # max against the transparent atlas copies pixels without blending
+            atlas.blit(image, (i * size[0], 0), special_flags=pygame.BLEND_RGBA_MAX)
+        for i, name in enumerate(names):
+            self.variants[(name, size)] = atlas.subsurface((i * size[0], 0, size[0], size[1]))
+            self.unconverted.discard((name, size))
+        self.atlases[size] = atlas
+        return atlas
+
+    def clear(self):
+        self.originals.clear()
+        self.variants.clear()
+        self.unconverted.clear()
+        self.atlases.clear()
+
+assets = AssetManager()
@@ -0,0 +1,209 @@
+# src/benchmark.py
+#
+# Headless rendering benchmark. Plays the whole game under SDL's dummy video
+# driver with scripted input (the intro typing, the 5 x 5 rounds of the 1v1
+# mode, the tournament stepping and every transition) and reports frames/sec,
+# p50/p99 frame time, the frames that drew and peak resident memory per
+# scene:
+#
+#   python -m src.benchmark --frames 120 --output benchmark.json
+#   python -m src.benchmark --min-fps 200 --max-p99-ms 20
+#
+# Run it from the repository root, like main.py. Frames are not capped by
+# the clock; the timeline advances by a fixed 60 fps step so effects last as
+# many frames as they would in the game. The thresholds make it exit with
+# status 1 so CI can gate on them; a transition frame that skipped its draw
+# stops the run, since its timings would measure nothing.
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from src.game import Game
+from src.profiling import FrameProfiler, current_memory
+
+FRAME_MS = 1000 / 60
+
+# upper bound on the frames spent waiting for any one thing to finish
+MAX_WAIT_FRAMES = 5000
+
+class ScriptedPlaythrough:
+    def __init__(self, game, idle_frames=120, full_redraw=False):
+        self.game = game
+        self.idle_frames = idle_frames
+        # invalidate the whole screen every frame to measure worst-case draws
+        self.full_redraw = full_redraw
+        self.peak_memory = {}
+        # scene -> frames that ran the scene's draw pass
+        self.drawn = {}
+        self.frames = 0
+
+    def frame(self):
+        game = self.game
+        if self.full_redraw:
+            game.dirty_rects.invalidate()
+        scene = game.scene_name()
+        game.frame(FRAME_MS)
+        # the frame that is still a transition frame must have drawn, else the
+        # transition numbers time skipped frames
+        drawn = "scene_ms" in game.profiler.current
+        if not drawn and game.transition is not None:
+            raise RuntimeError("benchmark frame of a swipe transition was not drawn")
+        self.drawn[scene] = self.drawn.get(scene, 0) + drawn
+        memory = current_memory()
+        if memory is not None:
+            self.peak_memory[scene] = max(self.peak_memory.get(scene, 0), memory)
+        self.frames += 1
+
+    def post(self, event_type, pos, **attributes):
+        pygame.event.post(pygame.event.Event(event_type, pos=pos, **attributes))
+
+    def move(self, x, y):
+        self.post(pygame.MOUSEMOTION, (int(x), int(y)), rel=(0, 0), buttons=(0, 0, 0))
+
+    def click(self, x, y):
+        self.move(x, y)
+        self.post(pygame.MOUSEBUTTONDOWN, (int(x), int(y)), button=1)
+        self.post(pygame.MOUSEBUTTONUP, (int(x), int(y)), button=1)
+        self.frame()
+
+    def click_button(self, button):
+        self.click(button.x + button.width / 2, button.y + button.height / 2)
+
+    # idle frames with the mouse sweeping across the screen every few frames
+    def idle(self, frames=None):
+        width, height = self.game.settings.screen_width, self.game.settings.screen_height
+        for i in range(self.idle_frames if frames is None else frames):
+            if i % 4 == 0:
+                self.move((i * 37) % width, (i * 23) % height)
+            self.frame()
+
+    def wait_until(self, done):
+        for _ in range(MAX_WAIT_FRAMES):
+            if done():
+                return
+            self.frame()
+        raise RuntimeError("benchmark script got stuck in scene " + self.game.scene_name())
+
+    def wait_transition(self):
+        self.wait_until(lambda: self.game.transition is None)
+
+    def wait_typing(self, lines):
+        self.wait_until(lambda: self.game.current_line >= len(lines))
+
+    def play(self):
+        game = self.game
+
+        # intro, 1v1 intro and the payoff table
+        for lines in (game.intro_text, game.player_intro_text, None):
+            if lines:
+                self.wait_typing(lines)
+            self.idle()
+            self.click_button(game.continue_button)
+            self.wait_transition()
+
+        # 1v1 mode: 5 opponents x 5 rounds, alternating moves
+        data = game.player_page_data
+        self.idle()
+        for match in range(game.num_opponents):
+            for round_number in range(game.num_rounds):
+                button = data['use_button'] if (match + round_number) % 2 == 0 else data['dont_use_button']
+                self.click_button(button)
+                self.wait_until(lambda: data['match_state'] == 'waiting')
+        self.idle()
+        self.click_button(data['next_button'])
+        self.wait_transition()
+
+        # explanation page
+        self.idle()
+        next_button = game.tournament_page_data['next_button']
+        self.click_button(next_button)
+        self.click_button(next_button)
+        self.wait_transition()
+
+        # tournament intro
+        self.wait_typing(game.tournament_intro_text)
+        self.idle()
+        self.click_button(game.continue_button)
+        self.wait_transition()
+
+        # tournament: step through every match, the last click moves on
+        for _ in range(len(game.tournament_page_data['round_data']) + 1):
+            self.click_button(next_button)
+            self.idle(self.idle_frames // 4)
+        self.wait_transition()
+
+        # payoff, takeaways and credits
+        for _ in range(2):
+            self.idle()
+            self.click(game.navright.x + game.navright.size / 2, game.navright.y + game.navright.size / 2)
+            self.wait_transition()
+        self.idle()
+
+def run_benchmark(idle_frames=120, full_redraw=False):
+    pygame.init()
+    game = Game()
+    # every frame counts, not only the profiler's rolling window
+    game.profiler = FrameProfiler(window=None)
+    playthrough = ScriptedPlaythrough(game, idle_frames, full_redraw)
+    playthrough.play()
+    game.profiler.end_frame()
+
+    scenes = {}
+    for scene in game.profiler.scenes:
+        summary = game.profiler.summary(scene)
+        summary["peak_memory_bytes"] = playthrough.peak_memory.get(scene)
+        summary["drawn_frames"] = playthrough.drawn.get(scene, 0)
+        scenes[scene] = summary
+    pygame.quit()
+    return {"frames": playthrough.frames, "full_redraw": full_redraw, "scenes": scenes}
+
+def print_report(report, output=sys.stdout):
+    print(f"{'scene':<24}{'frames':>8}{'drawn':>8}{'fps':>10}{'p50 ms':>9}{'p99 ms':>9}{'peak MB':>9}", file=output)
+    for scene, summary in report["scenes"].items():
+        memory = summary["peak_memory_bytes"]
+        memory = f"{memory / 2**20:.1f}" if memory is not None else "-"
+        print(f"{scene:<24}{summary['frames']:>8}{summary['drawn_frames']:>8}{summary['fps']:>10.1f}"
+              f"{summary['frame_p50_ms']:>9.2f}{summary['frame_p99_ms']:>9.2f}{memory:>9}", file=output)
+
+# scenes that miss a threshold, as messages
+def check_thresholds(report, min_fps=None, max_p99_ms=None):
+    failures = []
+    for scene, summary in report["scenes"].items():
+        if min_fps is not None and summary["fps"] < min_fps:
+            failures.append(f"{scene}: {summary['fps']:.1f} fps is below {min_fps}")
+        if max_p99_ms is not None and summary["frame_p99_ms"] > max_p99_ms:
+            failures.append(f"{scene}: p99 frame time {summary['frame_p99_ms']:.2f} ms is above {max_p99_ms}")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark", description="Headless rendering benchmark.")
+    parser.add_argument("--frames", type=int, default=120, help="idle frames per scene between scripted inputs")
+    parser.add_argument("--full-redraw", action="store_true", help="redraw the whole screen every frame")
+    parser.add_argument("--output", default=None, help="write the report as JSON")
+    parser.add_argument("--min-fps", type=float, default=None, help="fail if any scene runs slower")
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="fail if any scene's p99 frame time is higher")
+    args = parser.parse_args(argv)
+    if args.frames < 1:
+        raise SystemExit("--frames must be at least 1")
+
+    report = run_benchmark(args.frames, args.full_redraw)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    failures = check_thresholds(report, args.min_fps, args.max_p99_ms)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# src/cache.py
+#
+# On-disk cache of league payoff matrices. Each config (strategies, rounds,
+# damage constants, payoff weights, seed) hashes to one .npy file holding the
+# (N, N) payoff matrix, memory-mapped on load. NaN marks a pairing that is
+# missing or was invalidated; only those get recomputed.
+import hashlib
+import inspect
+import json
+import os
+
+import numpy as np
+
+from src.parallel import DEFAULT_TILE_SIZE, play_pairs_parallel
+from src.strategies import Strategy, compile_tables, get_strategy, is_compiled
+from src.tournament import pair_payoffs, to_league_results
+
+CACHE_DIR = os.environ.get("AW_CACHE_DIR", os.path.join(".cache", "league"))
+
+# bump when a change to the simulation makes old cache files wrong
+CACHE_VERSION = 1
+
+# What a strategy plays, so editing one changes the cache key: the compiled
+# table of memory-one strategies, the source of the others (with their base
+# classes, whose choose/update they may inherit).
+def strategy_fingerprint(strategy):
+    cls = get_strategy(int(strategy))
+    fingerprint = {"name": cls.name, "memory": cls.memory}
+    if is_compiled(strategy):
+        fingerprint["table"] = compile_tables([int(strategy)])[0].tolist()
+    else:
+        sources = []
+        for base in cls.__mro__:
+            if isinstance(base, type) and issubclass(base, Strategy):
+                try:
+                    sources.append(inspect.getsource(base))
+                except (OSError, TypeError):
+                    # no source to read, e.g. a frozen build
+                    sources.append(base.__qualname__)
+        fingerprint["source"] = hashlib.sha256("\n".join(sources).encode()).hexdigest()
+    return fingerprint
+
+# evaluator is "league" (Engine.run_league_simulation) or "tournament"
+# (the vectorized evaluator); they draw their random moves differently
+def config_key(engine, seed, evaluator="league"):
+    config = {
+        "version": CACHE_VERSION,
+        "evaluator": evaluator,
+        "strategies": [strategy_fingerprint(strategy) for strategy in engine.strategies],
+        "num_rounds": engine.num_rounds,
+        "min_damage": engine.min_damage,
+        "mid_damage": engine.mid_damage,
+        "max_damage": engine.max_damage,
+        "life_weight": engine.life_weight,
+        "resource_weight": engine.resource_weight,
+        "seed": seed,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:32]
+
+class LeagueCache:
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".npy")
+
+    # read-only memory map of the matrix, or None if it was never stored
+    def load(self, key):
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r")
+
+    # writable memory map, created full of NaN on first use
+    def open(self, key, num_players):
+        path = self.path(key)
+        if os.path.exists(path):
+            matrix = np.load(path, mmap_mode="r+")
+            if matrix.shape == (num_players, num_players):
+                return matrix
+        os.makedirs(self.directory, exist_ok=True)
+        matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(num_players, num_players))
+        matrix[:] = np.nan
+        return matrix
+
+    # forget pairings so the next run recomputes them; players is a list of
+    # indices whose rows and columns are dropped, None drops everything
+    def invalidate(self, key, players=None):
+        path = self.path(key)
+        if not os.path.exists(path):
+            return
+        if players is None:
+            os.remove(path)
+            return
+        matrix = np.load(path, mmap_mode="r+")
+        matrix[players, :] = np.nan
+        matrix[:, players] = np.nan
+        matrix.flush()
+
+# (p1, p2) with p1 <= p2 where either payoff is missing
+def missing_pairs(matrix):
+    missing = np.isnan(matrix)
+    missing = np.triu(missing | missing.T)
+    p1, p2 = np.nonzero(missing)
+    return p1.astype(np.intp), p2.astype(np.intp)
+
+# (N, N) float64 league payoff matrix through the cache: a warm start is one
+# memory-mapped load, a partial file only replays the missing pairings
+def cached_league_matrix(engine, seed, cache=None):
+    cache = cache or LeagueCache()
+    key = config_key(engine, seed, "league")
+    num_players = len(engine.strategies)
+
+    matrix = cache.load(key)
+    if matrix is not None and matrix.shape == (num_players, num_players) and not np.isnan(matrix).any():
+        return matrix
+
+    matrix = cache.open(key, num_players)
+    # run_league_simulation fills the -1 entries in place
+    league_results = np.where(np.isnan(matrix), -1.0, matrix)
+    p1, p2 = missing_pairs(matrix)
+    league_results[p1, p2] = -1
+    league_results[p2, p1] = -1
+
+    engine.run_league_simulation(league_results, seed=seed)
+
+    matrix[:] = league_results
+    matrix.flush()
+    return league_results
+
+# league_results dict-of-lists through the cache
+def cached_league_results(engine, seed, cache=None):
+    return to_league_results(cached_league_matrix(engine, seed, cache))
+
+# payoff matrix of the vectorized evaluator through the cache; the missing
+# pairings are played on workers processes
+def cached_payoffs(engine, seed, cache=None, workers=1, tile_size=DEFAULT_TILE_SIZE):
+    cache = cache or LeagueCache()
+    key = config_key(engine, seed, "tournament")
+    num_players = len(engine.strategies)
+
+    matrix = cache.load(key)
+    if matrix is not None and matrix.shape == (num_players, num_players) and not np.isnan(matrix).any():
+        return matrix
+
+    matrix = cache.open(key, num_players)
+    p1, p2 = missing_pairs(matrix)
+    if len(p1):
+        outcome_counts = play_pairs_parallel(engine.strategies, p1, p2, engine.num_rounds, seed, workers, tile_size)
+        p1_payoff, p2_payoff = pair_payoffs(engine, outcome_counts)
+        matrix[p1, p2] = p1_payoff
+        matrix[p2, p1] = p2_payoff
+        matrix.flush()
+    return matrix
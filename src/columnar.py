@@ -0,0 +1,95 @@
+# src/columnar.py
+#
+# Minimal columnar file format: a directory with one raw little-endian file
+# per column and a schema.json describing dtypes, trailing shapes and the row
+# count. Writers append chunks as they stream in, readers memory-map each
+# column, so neither side has to hold the whole table in memory.
+import json
+import os
+
+import numpy as np
+
+SCHEMA_FILE = "schema.json"
+
+def _column_path(directory, name):
+    return os.path.join(directory, name + ".bin")
+
+class ColumnWriter:
+    def __init__(self, directory):
+        self.directory = directory
+        self.columns = None
+        self.rows = 0
+        os.makedirs(directory, exist_ok=True)
+        self.files = {}
+
+    # chunk maps column name -> array with the same number of rows
+    def append(self, chunk):
+        arrays = {name: np.ascontiguousarray(values) for name, values in chunk.items()}
+        rows = {len(values) for values in arrays.values()}
+        if len(rows) != 1:
+            raise ValueError("All columns of a chunk need the same number of rows")
+
+        if self.columns is None:
+            self.columns = {
+                name: {"dtype": values.dtype.newbyteorder("<").str, "shape": list(values.shape[1:])}
+                for name, values in arrays.items()
+            }
+            for name in self.columns:
+                self.files[name] = open(_column_path(self.directory, name), "wb")
+        elif set(arrays) != set(self.columns):
+            raise ValueError("Chunk columns do not match the first chunk")
+
+        for name, values in arrays.items():
+            column = self.columns[name]
+            if list(values.shape[1:]) != column["shape"]:
+                raise ValueError(f"Column {name!r} changed shape")
+            self.files[name].write(values.astype(column["dtype"], copy=False).tobytes())
+
+        self.rows += rows.pop()
+        self._write_schema()
+
+    def _write_schema(self):
+        for column_file in self.files.values():
+            column_file.flush()
+        path = os.path.join(self.directory, SCHEMA_FILE)
+        with open(path + ".tmp", "w") as schema_file:
+            json.dump({"rows": self.rows, "columns": self.columns or {}}, schema_file)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        self._write_schema()
+        for column_file in self.files.values():
+            column_file.close()
+        self.files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ColumnReader:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, SCHEMA_FILE)) as schema_file:
+            schema = json.load(schema_file)
+        self.rows = schema["rows"]
+        self.columns = schema["columns"]
+
+    # memory-mapped column, rows x shape
+    def column(self, name):
+        column = self.columns[name]
+        shape = (self.rows, *column["shape"])
+        if self.rows == 0:
+            return np.empty(shape, dtype=column["dtype"])
+        return np.memmap(_column_path(self.directory, name), dtype=column["dtype"], mode="r", shape=shape)
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    # iterate over the table in slices of at most chunk_size rows
+    def chunks(self, chunk_size, names=None):
+        names = names or list(self.columns)
+        columns = {name: self.column(name) for name in names}
+        for start in range(0, self.rows, chunk_size):
+            yield {name: values[start:start + chunk_size] for name, values in columns.items()}
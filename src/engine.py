@@ -0,0 +1,147 @@
+# src/engine.py
+#
+# Display-free simulation engine. Everything in here works on plain data
+# (choices, lives, resources, payoffs) so it can run without pygame.
+import random
+
+from src.settings import Settings
+from src.strategies import STRATEGY_IDS, make_strategy
+
+# 1 - use ; 0 - not use
+USE = 1
+DONT_USE = 0
+
+MASK64 = (1 << 64) - 1
+
+# splitmix64 finalizer, used to derive independent seeds from small integers
+def mix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+# seed of one pairing, so a pairing plays the same way whoever plays it
+def pair_seed(seed, p1, p2):
+    return mix64(mix64(mix64(seed & MASK64) ^ p1) ^ p2)
+
+# random source of one 1v1 match of a session; the game and the replay both
+# draw the opponent's moves from it, so a recorded session plays back the same
+def match_rng(seed, match, opponent):
+    return random.Random(pair_seed(seed, match, opponent))
+
+# Running total of lives and resources lost by one side
+class Score:
+    def __init__(self, lives=0, resources=0):
+        self.lives = lives
+        self.resources = resources
+
+    def reset(self):
+        self.lives = 0
+        self.resources = 0
+
+class MatchResult:
+    def __init__(self, p1, p2, rounds, p1_score, p2_score, p1_payoff, p2_payoff):
+        self.p1 = p1
+        self.p2 = p2
+        # [(p1_choice, p2_choice), ...], None if the match was played without keeping them
+        self.rounds = rounds
+        self.p1_score = p1_score
+        self.p2_score = p2_score
+        self.p1_payoff = p1_payoff
+        self.p2_payoff = p2_payoff
+
+class Engine:
+    def __init__(self, num_rounds=5, life_weight=0.7, resource_weight=0.3,
+                 min_damage=1, mid_damage=10, max_damage=100, strategies=None):
+        self.num_rounds = num_rounds
+
+        # payoff = life_weight * lives + resource_weight * resources
+        self.life_weight = life_weight
+        self.resource_weight = resource_weight
+
+        # damage weights applied to life & resources
+        self.min_damage = min_damage
+        self.mid_damage = mid_damage
+        self.max_damage = max_damage
+
+        # strategy ids taking part in the league, one per opponent
+        if strategies is None:
+            strategies = [STRATEGY_IDS[name] for name in Settings.strategies]
+        self.strategies = list(strategies)
+
+    # lives & resources each side loses for one round
+    # returns (p1_lives, p1_resources, p2_lives, p2_resources)
+    def damage(self, p1_choice, p2_choice):
+        # use nash equilibrium
+        if p1_choice == 1 and p2_choice == 1:
+            return (-self.mid_damage, -self.max_damage, -self.mid_damage, -self.max_damage)
+        elif p1_choice == 1 and p2_choice == 0:
+            return (0, -self.max_damage, -self.max_damage, 0)
+        elif p1_choice == 0 and p2_choice == 1:
+            return (-self.max_damage, 0, 0, -self.max_damage)
+        elif p1_choice == 0 and p2_choice == 0:
+            return (-self.min_damage, -self.mid_damage, -self.min_damage, -self.mid_damage)
+        return (0, 0, 0, 0)
+
+    # p1 and p2 can be anything with lives & resources attributes
+    def update_resources(self, p1_choice, p2_choice, p1, p2):
+        p1_lives, p1_resources, p2_lives, p2_resources = self.damage(p1_choice, p2_choice)
+        p1.lives += p1_lives
+        p1.resources += p1_resources
+        p2.lives += p2_lives
+        p2.resources += p2_resources
+
+    def compute_payoff(self, score):
+        return (self.life_weight * score.lives) + (self.resource_weight * score.resources)
+
+    def play_match(self, p1, p2, rng=random, keep_rounds=True):
+        p1_score = Score()
+        p2_score = Score()
+        rounds = [] if keep_rounds else None
+
+        p1_strategy = make_strategy(self.strategies[p1], rng)
+        p2_strategy = make_strategy(self.strategies[p2], rng)
+
+        for r in range(self.num_rounds):
+            p1_choice = p1_strategy.choose()
+            p2_choice = p2_strategy.choose()
+
+            self.update_resources(p1_choice, p2_choice, p1_score, p2_score)
+            p1_strategy.update(p2_choice, p1_choice)
+            p2_strategy.update(p1_choice, p2_choice)
+            if keep_rounds:
+                rounds.append((p1_choice, p2_choice))
+
+        return MatchResult(p1, p2, rounds, p1_score, p2_score,
+                           self.compute_payoff(p1_score), self.compute_payoff(p2_score))
+
+    # league_results[0][1] = strategies[0] payoff in strategies[0] vs strategies[1]
+    # league_results[1][0] = strategies[1] payoff in strategies[0] vs strategies[1]
+    def new_league_results(self):
+        num_players = len(self.strategies)
+        return {i: [-1] * num_players for i in range(num_players)}
+
+    # with a seed every pairing gets its own random.Random(pair_seed(...)),
+    # otherwise the matches share rng
+    def run_league_simulation(self, league_results=None, rng=random, seed=None):
+        if league_results is None:
+            league_results = self.new_league_results()
+
+        num_players = len(self.strategies)
+        for p1 in range(num_players):
+            for p2 in range(num_players):
+
+                # skip if already calculated
+                if (league_results[p1][p2] != -1):
+                    continue
+
+                if seed is not None:
+                    match = self.play_match(p1, p2, random.Random(pair_seed(seed, p1, p2)), keep_rounds=False)
+                else:
+                    match = self.play_match(p1, p2, rng, keep_rounds=False)
+
+                # store payoffs
+                league_results[p1][p2] = match.p1_payoff
+                league_results[p2][p1] = match.p2_payoff
+
+        return league_results
@@ -0,0 +1,134 @@
+# src/evolution.py
+#
+# Population mode. The league payoff matrix is the fitness landscape: a
+# generation is matrix-vector math over the cached matrix, matches are never
+# replayed. payoffs[i][j] is the payoff of strategy i against strategy j, as
+# in league_results.
+from bisect import bisect_right
+from itertools import accumulate
+from math import exp
+from operator import add, mul, sub
+
+import numpy as np
+
+# Payoffs are losses, so fitness is exp(selection * payoff), which is always
+# positive. selection = 0 is neutral drift, larger values select harder.
+DEFAULT_SELECTION = 0.01
+
+def fitness(payoffs, shares, selection=DEFAULT_SELECTION):
+    expected = payoffs @ shares
+    return np.exp(selection * (expected - expected.max()))
+
+# one discrete replicator-dynamics generation: x_i' = x_i * f_i / mean(f)
+def replicator_step(payoffs, shares, selection=DEFAULT_SELECTION):
+    weighted = shares * fitness(payoffs, shares, selection)
+    return weighted / weighted.sum()
+
+# (generations // record_every + 1, N) population shares, starting with shares.
+# Once the shares stop moving by more than tolerance over a block of
+# generations the rest of the trajectory is filled in with the fixed point.
+def run_replicator(payoffs, generations, shares=None, selection=DEFAULT_SELECTION,
+                   record_every=1, tolerance=1e-15):
+    payoffs = np.asarray(payoffs, dtype=np.float64)
+    num_strategies = len(payoffs)
+    if shares is None:
+        shares = np.full(num_strategies, 1.0 / num_strategies)
+    shares = np.array(shares, dtype=np.float64)
+    shares /= shares.sum()
+
+    # selection is folded into the matrix; the loop reuses its buffers
+    scaled = selection * payoffs
+    expected = np.empty(num_strategies)
+    checkpoint = shares.copy()
+    check_every = max(record_every, 1024)
+
+    trajectory = np.empty((generations // record_every + 1, num_strategies))
+    trajectory[0] = shares
+    for generation in range(1, generations + 1):
+        np.dot(scaled, shares, out=expected)
+        expected -= expected.max()
+        np.exp(expected, out=expected)
+        shares *= expected
+        shares /= shares.sum()
+        if generation % record_every == 0:
+            trajectory[generation // record_every] = shares
+        if generation % check_every == 0:
+            if np.abs(shares - checkpoint).max() <= tolerance:
+                trajectory[generation // record_every + 1:] = shares
+                break
+            checkpoint[:] = shares
+    return trajectory
+
+# Moran process on a finite population of population_size individuals. Each
+# generation one individual reproduces (chosen proportionally to count *
+# fitness) and one dies (chosen uniformly). With probability mutation the
+# offspring takes a uniformly random other strategy.
+def run_moran(payoffs, population_size, generations, counts=None, selection=DEFAULT_SELECTION,
+              mutation=0.0, seed=None, record_every=1):
+    payoffs = np.asarray(payoffs, dtype=np.float64)
+    num_strategies = len(payoffs)
+    if population_size < 2:
+        raise ValueError("Moran process needs a population of at least 2")
+    if counts is None:
+        counts = np.full(num_strategies, population_size // num_strategies, dtype=np.int64)
+        counts[:population_size % num_strategies] += 1
+    counts = np.array(counts, dtype=np.int64)
+    if counts.sum() != population_size:
+        raise ValueError("counts must add up to population_size")
+
+    rng = np.random.default_rng(seed)
+    # random numbers are drawn in blocks to keep the loop cheap
+    block = min(generations, 65536) or 1
+    diagonal = np.diag(payoffs)
+
+    # One birth and one death per generation, so the expected payoffs
+    # (payoffs @ counts - diagonal) / (population_size - 1) only move by a
+    # column difference: the log-fitness selection * expected changes by
+    # step[child] - step[dead] and is exponentiated against its maximum, so
+    # large payoffs can't underflow the fitness to 0. It is recomputed exactly
+    # every block so rounding cannot drift. The loop itself works on Python
+    # lists: for a handful of strategies map/accumulate/bisect beat numpy's
+    # per-call cost.
+    step = (selection / (population_size - 1) * payoffs.T).tolist()
+    # the strategy of every individual, so the one that dies is one lookup
+    slots = np.repeat(np.arange(num_strategies), counts).tolist()
+    counts_list = counts.tolist()
+
+    trajectory = np.empty((generations // record_every + 1, num_strategies), dtype=np.int64)
+    trajectory[0] = counts
+    for generation in range(1, generations + 1):
+        k = (generation - 1) % block
+        if k == 0:
+            counts = np.array(counts_list, dtype=np.int64)
+            draws = rng.random((block, 3)).tolist()
+            mutants = (rng.integers(0, num_strategies - 1, block) if num_strategies > 1 else np.zeros(block, dtype=np.int64)).tolist()
+            # average payoff against everybody else in the population
+            expected = (payoffs @ counts - diagonal) / (population_size - 1)
+            log_fit = (selection * expected).tolist()
+            top = max(log_fit)
+            fit = [exp(value - top) for value in log_fit]
+
+        parent_draw, mutation_draw, death_draw = draws[k]
+        cumulative = list(accumulate(map(mul, counts_list, fit)))
+        parent = min(bisect_right(cumulative, parent_draw * cumulative[-1]), num_strategies - 1)
+        child = parent
+        if mutation_draw < mutation and num_strategies > 1:
+            # any strategy but the parent's
+            child = mutants[k] + (mutants[k] >= parent)
+        slot = min(int(death_draw * population_size), population_size - 1)
+        dead = slots[slot]
+
+        if child != dead:
+            slots[slot] = child
+            counts_list[child] += 1
+            counts_list[dead] -= 1
+            log_fit = list(map(sub, map(add, log_fit, step[child]), step[dead]))
+            top = max(log_fit)
+            fit = [exp(value - top) for value in log_fit]
+        if generation % record_every == 0:
+            trajectory[generation // record_every] = counts_list
+    return trajectory
+
+# strategies that survive the run, largest share first
+def ranking(shares):
+    return list(np.argsort(-np.asarray(shares), kind="stable"))
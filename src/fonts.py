@@ -0,0 +1,94 @@
+# src/fonts.py
+#
+# Process-wide font registry. Every (path, size) pair is loaded from disk
+# once and the same pygame Font is handed to every page, so FreeType faces
+# are not rebuilt per frame and the text cache, which is keyed by the font
+# object, keeps hitting. Fonts that aren't needed right away can be loaded on
+# a background thread, e.g. while the intro text is typing.
+#
+# A pygame Font must not outlive the font module: using one after
+# pygame.quit() (even after a new pygame.init()) crashes. The registry
+# empties itself on pygame.quit(), and whenever it finds the font module shut
+# down, together with anything registered in on_clear, like the text cache
+# whose keys are fonts.
+import os
+import threading
+import time
+
+import pygame
+
+FONT_PATH = os.path.join("assets", "fonts", "PixelOperatorSC-Bold.ttf")
+
+class FontRegistry:
+    def __init__(self):
+        # (path, size) -> pygame Font
+        self.fonts = {}
+        # (path, size) -> load time in ms
+        self.load_ms = {}
+        self.hits = 0
+        self.loads = 0
+        # held while a font loads, so a font being preloaded is only built once
+        self.lock = threading.Lock()
+        # called by clear(), for caches keyed by the fonts
+        self.on_clear = []
+        # whether clear() is registered to run on pygame.quit()
+        self.quit_registered = False
+
+    # the font at path and size, loaded on first use; path None is pygame's
+    # default font
+    def get(self, path=FONT_PATH, size=20):
+        key = (path, int(size))
+        if not pygame.font.get_init():
+            # the fonts, if any, belong to a font module that was shut down
+            self.clear()
+        font = self.fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is None:
+                if not self.quit_registered:
+                    # pygame forgets registered functions once it has called them
+                    pygame.register_quit(self.clear)
+                    self.quit_registered = True
+                start = time.perf_counter()
+                font = pygame.font.Font(path, key[1])
+                self.load_ms[key] = (time.perf_counter() - start) * 1000
+                self.loads += 1
+                self.fonts[key] = font
+            else:
+                self.hits += 1
+        return font
+
+    # Load (path, size) pairs ahead of time. With background=True they load
+    # on a daemon thread, which is returned; get() waits for a font that is
+    # still loading instead of loading it twice.
+    def preload(self, specs, background=False):
+        specs = list(specs)
+        if not background:
+            for path, size in specs:
+                self.get(path, size)
+            return None
+        thread = threading.Thread(target=self.preload, args=(specs,), name="font-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def metrics(self):
+        return {
+            "loaded": len(self.fonts),
+            "loads": self.loads,
+            "hits": self.hits,
+            "load_ms": sum(self.load_ms.values()),
+            "fonts": [{"path": path, "size": size, "load_ms": ms} for (path, size), ms in self.load_ms.items()],
+        }
+
+    def clear(self):
+        with self.lock:
+            self.fonts.clear()
+            self.load_ms.clear()
+            self.quit_registered = False
+        for callback in self.on_clear:
+            callback()
+
+fonts = FontRegistry()
@@ -1,28 +1,75 @@
 # src/game.py
 
 import pygame
-import os
+import sys
 from src.settings import Settings
+from src.assets import assets
+from src.fonts import FONT_PATH, fonts
+from src.engine import Engine, match_rng
+from src.cache import cached_league_matrix
+from src.history import MatchHistory
+from src.strategies import make_strategy
+from src.timeline import Timeline
+from src.tournament import league_matrix, random_seed
+from src.profiling import FrameProfiler, StartupProfile
 from src.sprites import *
 from src.utils import *
 
 class Game:
-    def __init__(self):
+    # profile is a StartupProfile that gets a checkpoint after each phase;
+    # telemetry is a TelemetryWriter that gets the player's decisions; seed
+    # fixes the opponents' random moves in the 1v1 mode
+    def __init__(self, profile=None, telemetry=None, seed=None):
         self.settings = Settings()
+        self.startup_profile = profile or StartupProfile()
+        self.telemetry = telemetry
+        if seed is None:
+            seed = self.settings.session_seed
+        self.session_seed = random_seed() if seed is None else seed
         self.screen = pygame.display.set_mode((self.settings.screen_width, self.settings.screen_height))
         pygame.display.set_caption("Autonomous Weapons Simulation")
-        icon_path = os.path.join("assets", "images", "icon.png")
-        self.icon = pygame.image.load(icon_path)
+        self.startup_profile.mark("display.set_mode")
+        self.icon = assets.load("icon.png")
         pygame.display.set_icon(self.icon)
+        if self.settings.sprite_atlas:
+            assets.build_atlas([player_image] + [opponent['image'] for opponent in opponents], (sprite_size, sprite_size))
+        self.startup_profile.mark("icon and sprites")
         self.clock = pygame.time.Clock()
+        # alerts and transitions run on the timeline instead of blocking
+        self.timeline = Timeline()
+        self.transition = None
+        self.frame_time = 0
+        self.mouse = pygame.mouse.get_pos()
+        # off-screen surfaces are reused across frames instead of reallocated
+        self.surface_pool = SurfacePool()
+        set_surface_pool(self.surface_pool)
+        # only the regions that changed are redrawn and pushed to the display
+        self.dirty_rects = DirtyRects(self.screen.get_rect())
+        set_dirty_rects(self.dirty_rects)
         self.player = Player()
         self.countries = [Country(strategy) for strategy in self.settings.strategies]
-        font_path = os.path.join("assets", "fonts", "PixelOperatorSC-Bold.ttf")
-        self.font = pygame.font.Font(font_path, 20)
+        self.font = fonts.get(FONT_PATH, 20)
+        # the overlay font is only needed on F3, load it while the intro types
+        fonts.preload([(FONT_PATH, 14)], background=True)
+        self.startup_profile.mark("fonts")
+
+        # frame timings per scene, shown by the F3 overlay
+        self.profiler = FrameProfiler()
+        self.show_hud = self.settings.show_hud
+        self.hud = None
+        self.scene_names = {0: "intro_page", 1: "player_intro_page", 2: "player_intro_info", 3: "player_page",
+                            4: "explanation_page", 5: "tournament_intro_page", 6: "tournament_page",
+                            7: "payoff_page", 8: "takeaways_page", 9: "credits_page"}
         self.display_time = 1000  # 1 second
-        self.num_rounds = 5
+        self.engine = Engine(num_rounds=5, strategies=[opponent['id'] for opponent in opponents])
+        self.num_rounds = self.engine.num_rounds
         self.num_opponents = len(opponents)
         self.player_name = "You" 
+        # everything a replay needs to play the session back
+        self.log_event("session", seed=self.session_seed, num_rounds=self.engine.num_rounds,
+                       life_weight=self.engine.life_weight, resource_weight=self.engine.resource_weight,
+                       min_damage=self.engine.min_damage, mid_damage=self.engine.mid_damage,
+                       max_damage=self.engine.max_damage)
 
         # color definitions
         self.rgb_colors = dict()
@@ -34,17 +81,10 @@ class Game:
         self.rgb_colors["black"] = (0,0,0)
         self.rgb_colors["explosion_color"] = (138, 2, 2) # blood red
 
+        # (N, N) float64 matrix, -1 until played
         # league_results[0][1] = opponents[0] payoff in opponents[0] vs opponents[1]
         # league_results[1][0] = opponents[1] payoff in opponents[0] vs opponents[1]
-        self.league_results = {i: [-1] * self.num_opponents for i in range(self.num_opponents)}
-
-        self.life_weight = 0.7
-        self.resource_weight = 0.3
-        # damage weights applied to life & resources
-    
-        self.min_damage = 1
-        self.mid_damage = 10
-        self.max_damage = 100
+        self.league_results = league_matrix(self.engine.new_league_results())
 
         self.intro_text = [
             "Welcome to our simulation exploring", 
@@ -106,11 +146,13 @@ class Game:
                 (3*self.settings.screen_width // 4) - 175, self.settings.screen_height*0.75, 
                 350, 50,
                 self.rgb_colors["red"], self.rgb_colors["dark_red"], self.font), # red
-            'past_matches': [],
+            # choices, lives, resources and payoffs of every match; the
+            # player is p1 (-1) and the opponent index is p2
+            'history': MatchHistory(self.num_rounds, capacity=self.num_opponents),
             'match_state': 'waiting',
             'current_match': 0,
-            'rounds': [],
             'current_opponent': opponents[0],
+            'opponent_strategy': make_strategy(opponents[0]['id']),
             'player_selection': None,
             'computer_selection': None,
             'player_selection_alert': None,
@@ -124,14 +166,6 @@ class Game:
                 self.settings.screen_width//2, 50,
                 (200, 200, 200), (225, 225, 225), self.font),
 
-            # index = match's payoff
-            # [(player_payoff, comp_payoff), (...)]
-            'payoffs': [],
-            
-            # hold player lives and resources lost each match
-            'player_lives_lost_match': [],
-            'player_resources_lost_match': [],
-
             # display lives and resources lost at end of game for total score 
             'player_lives_lost': 0,
             'player_resources_lost': 0,
@@ -215,14 +249,17 @@ class Game:
                   "in a conflict, leading to greater loss of life and resources in the long run."]
         }
 
+        self.startup_profile.mark("page data and buttons")
+
         # calculate league simulation results before rendering
         self.run_league_simluation()
+        self.startup_profile.mark("league simulation")
 
 
     def _display_intro_text(self):
         y = 100
         for i, line in enumerate(self.intro_text[:self.current_line]):
-            text_surface = self.font.render(line, True, (0, 0, 0))
+            text_surface = render_text(self.font, line, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, y))
             self.screen.blit(text_surface, text_rect)
             y += 30
@@ -230,11 +267,12 @@ class Game:
         # typing effect for the current line
         if self.current_line < len(self.intro_text):
             current_text = self.intro_text[self.current_line][:self.current_char]
-            text_surface = self.font.render(current_text, True, (0, 0, 0))
+            text_surface = render_text(self.font, current_text, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, y))
             self.screen.blit(text_surface, text_rect)
+            mark_dirty((0, y - 15, self.settings.screen_width, 30))
 
-        self.elapsed_time += self.clock.get_time()
+        self.elapsed_time += self.frame_time
         if self.elapsed_time > self.char_interval:
             self.current_char += 1
             self.elapsed_time = 0
@@ -245,7 +283,7 @@ class Game:
     def _display_tournament_intro_text(self):
         y = 100
         for i, line in enumerate(self.tournament_intro_text[:self.current_line]):
-            text_surface = self.font.render(line, True, (0, 0, 0))
+            text_surface = render_text(self.font, line, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, y))
             self.screen.blit(text_surface, text_rect)
             y += 30
@@ -253,11 +291,12 @@ class Game:
         # typing effect for the current line
         if self.current_line < len(self.tournament_intro_text):
             current_text = self.tournament_intro_text[self.current_line][:self.current_char]
-            text_surface = self.font.render(current_text, True, (0, 0, 0))
+            text_surface = render_text(self.font, current_text, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, y))
             self.screen.blit(text_surface, text_rect)
+            mark_dirty((0, y - 15, self.settings.screen_width, 30))
 
-        self.elapsed_time += self.clock.get_time()
+        self.elapsed_time += self.frame_time
         if self.elapsed_time > self.char_interval:
             self.current_char += 1
             self.elapsed_time = 0
@@ -265,17 +304,17 @@ class Game:
                 self.current_line += 1
                 self.current_char = 0
         
-        text_surface = self.font.render("Food for thought--the weight of human life against resources.", True, (0, 0, 160))
+        text_surface = render_text(self.font, "Food for thought--the weight of human life against resources.", True, (0, 0, 160))
         text_rect = text_surface.get_rect()
         text_rect.center = (385, 250)
         self.screen.blit(text_surface, text_rect)
 
-        text_surface = self.font.render("Payoff = Life Weight (w1) * Lost lives + Resource Weight (w2) * Lost Resources", True, (0, 0, 0))
+        text_surface = render_text(self.font, "Payoff = Life Weight (w1) * Lost lives + Resource Weight (w2) * Lost Resources", True, (0, 0, 0))
         text_rect = text_surface.get_rect()
         text_rect.center = (385, 280)
         self.screen.blit(text_surface, text_rect)
 
-        text_surface = self.font.render("W1 = 0.7, W2 = 0.3", True, (0, 0, 0))
+        text_surface = render_text(self.font, f"W1 = {self.engine.life_weight}, W2 = {self.engine.resource_weight}", True, (0, 0, 0))
         text_rect = text_surface.get_rect()
         text_rect.center = (385, 310)
         self.screen.blit(text_surface, text_rect)
@@ -283,7 +322,7 @@ class Game:
     def _display_player_intro_text(self):
         y = 100
         for i, line in enumerate(self.player_intro_text[:self.current_line]):
-            text_surface = self.font.render(line, True, (0, 0, 0))
+            text_surface = render_text(self.font, line, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, y))
             self.screen.blit(text_surface, text_rect)
             y += 30
@@ -291,11 +330,12 @@ class Game:
         # typing effect for the current line
         if self.current_line < len(self.player_intro_text):
             current_text = self.player_intro_text[self.current_line][:self.current_char]
-            text_surface = self.font.render(current_text, True, (0, 0, 0))
+            text_surface = render_text(self.font, current_text, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, y))
             self.screen.blit(text_surface, text_rect)
+            mark_dirty((0, y - 15, self.settings.screen_width, 30))
 
-        self.elapsed_time += self.clock.get_time()
+        self.elapsed_time += self.frame_time
         if self.elapsed_time > self.char_interval:
             self.current_char += 1
             self.elapsed_time = 0
@@ -307,7 +347,7 @@ class Game:
         # display desc_top
         desc_top_y = 60
         for line in self.info['desc_top']:
-            text_surface = self.font.render(line, True, (0, 0, 0))
+            text_surface = render_text(self.font, line, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, desc_top_y))
             self.screen.blit(text_surface, text_rect)
             desc_top_y += 30
@@ -320,16 +360,16 @@ class Game:
         for i in range(2):
             for j in range(2):
                 value = nash_values[i * 2 + j]
-                text_surface = self.font.render(value, True, (0, 0, 0))
+                text_surface = render_text(self.font, value, True, (0, 0, 0))
                 text_rect = text_surface.get_rect(center=(nash_x + j * 320, nash_y + i * 50))
                 self.screen.blit(text_surface, text_rect)
         
-        text_surface = self.font.render("Use AWs", True, (0, 0, 160))
+        text_surface = render_text(self.font, "Use AWs", True, (0, 0, 160))
         text_rect = text_surface.get_rect()
         text_rect.center = (220, 200)
         self.screen.blit(text_surface, text_rect)
 
-        text_surface = self.font.render("Don't use AWs", True, (0, 0, 160))
+        text_surface = render_text(self.font, "Don't use AWs", True, (0, 0, 160))
         text_rect = text_surface.get_rect()
         text_rect.center = (540, 200)
         self.screen.blit(text_surface, text_rect)
@@ -337,7 +377,7 @@ class Game:
         # display desc_bottom
         desc_bottom_y = 380
         for line in self.info['desc_bottom']:
-            text_surface = self.font.render(line, True, (0, 0, 0))
+            text_surface = render_text(self.font, line, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, desc_bottom_y))
             self.screen.blit(text_surface, text_rect)
             desc_bottom_y += 30
@@ -346,25 +386,86 @@ class Game:
     def run(self):
         # game loop
         while self.running:
+            self.frame(self.clock.get_time())
+            self.clock.tick(self.settings.fps)
+        self.profiler.end_frame()
+        self.log_event("session_end", scene=self.scene_name())
+
+    # queue a session telemetry event; a no-op without a TelemetryWriter
+    def log_event(self, event, **fields):
+        if self.telemetry is not None:
+            self.telemetry.log(event, **fields)
+
+    # one pass of the game loop; dt is how long the last frame took in ms
+    def frame(self, dt):
+        self.frame_time = dt
+        self.profiler.begin_frame(self.scene_name())
+        with self.profiler.section("events"):
             self._handle_events()
-            #self._update()
+        # timed effects advance by the last frame's duration
+        with self.profiler.section("timeline"):
+            self.timeline.update(dt)
+        with self.profiler.section("draw"):
             self._draw()
-            pygame.display.flip()
-            self.clock.tick(self.settings.fps)
+
+    # name of the scene method being shown, used to group frame timings
+    def scene_name(self):
+        if self.transition is not None:
+            return "swipe_transition"
+        return self.scene_names.get(self.current_scene, str(self.current_scene))
 
     def _draw(self):
-        self.screen.fill((255, 255, 255))
-        self.scene_manager()
-        pygame.display.update()
+        # nothing changed and nothing is animating: the last frame stays up;
+        # a transition redraws every frame until it ends
+        if self.transition is None and not self.dirty_rects.needs_draw():
+            return
+        self.surface_pool.begin_frame()
+        text_misses = text_cache.misses
+        with self.profiler.section("scene"):
+            if self.transition is not None:
+                self.draw_transition()
+            else:
+                self.screen.fill((255, 255, 255))
+                self.scene_manager()
+        if self.show_hud:
+            if self.hud is None:
+                self.hud = PerformanceHud(self.profiler, fonts.get(FONT_PATH, 14))
+            self.hud.draw(self.screen, self.scene_name())
+        with self.profiler.section("present"):
+            pygame.display.update(self.dirty_rects.flush())
+        self.profiler.add("alloc_bytes", self.surface_pool.frame_bytes)
+        self.profiler.add("text_misses", text_cache.misses - text_misses)
+        if self.settings.debug_allocations and self.surface_pool.frame_bytes:
+            print(f"frame {self.surface_pool.frame}: allocated {self.surface_pool.frame_bytes} bytes of surfaces", file=sys.stderr)
 
     def _handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
 
+            # the mouse position comes from the events, so scripted input
+            # (e.g. the headless benchmark) drives hover and clicks too
+            if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self.mouse = event.pos
+
+            # hover changes are reported by the widgets themselves, anything
+            # else (clicks, keys, window events) may change the whole scene
+            if event.type == pygame.MOUSEMOTION:
+                self.dirty_rects.wake()
+            else:
+                self.dirty_rects.invalidate()
+
+            # F3 toggles the performance overlay
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_hud = not self.show_hud
+
+            # scenes ignore input while a transition plays
+            if self.transition is not None:
+                continue
+
             # Handle nav arrows
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = self.mouse
                 if(self.navleft.is_hover(mouse_x, mouse_y)):
                     self.change_scene(self.current_scene - 1)
                 elif(self.navright.is_hover(mouse_x, mouse_y)):
@@ -387,98 +488,70 @@ class Game:
                 
     def handle_intro_events(self, event):
         if(event.type == pygame.MOUSEBUTTONDOWN):
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.mouse
             if self.continue_button.is_hover(mouse_x, mouse_y):
                 self.change_scene(self.current_scene+1)
-                pygame.time.wait(300)
 
     def change_scene(self, scene):
         self.swipe_transition(scene)
 
+    # Checkerboard swipe: the squares grow until they cover the screen, the
+    # scene switches, then they shrink away. Both halves are tweens on the
+    # timeline, so the game loop keeps running while it plays.
     def swipe_transition(self, scene):
+        if self.transition is not None:
+            return
         transition_duration = 1000
 
-        square_color = (0, 0, 0)
-
-        ysize = 10
-        ratio = round(self.settings.screen_width/self.settings.screen_height)
-        xsize = round(ysize * ratio)
-
-        xchecksize = round(self.settings.screen_width/xsize)
-        ychecksize = round(self.settings.screen_height/ysize)
-
-        square_positions = []
-        square_offsets = []
-
-        for i in range(xsize):
-            for j in range(ysize):
-                # find normalized centered position on screen using i and j
-                # add 0.5 because the pos will be the center of the checkerboard squares
-                ipos = (i+0.5)/xsize
-                jpos = (j+0.5)/ysize
-
-                # convert to screen position
-                x = ipos * self.settings.screen_width
-                y = jpos * self.settings.screen_height
-
-                # determine if it is an on or off square
-                # on = (i + j) % 2 == 0
-
-                square_positions.append((x, y))
-                square_offsets.append(((i+j)/((xsize-1) + (ysize-1)))/2)
-
-        grow_start_time = pygame.time.get_ticks()
-        while pygame.time.get_ticks() - grow_start_time < transition_duration // 2:
-            self.scene_manager()
+        self.transition = {'scene': scene, 'growing': True, 'progress': 0, 'snapshot': None}
+        self.transition['snapshot'] = self.snapshot_scene("transition_out")
 
-            progress = (pygame.time.get_ticks() - grow_start_time)/(transition_duration / 2)
+        def set_progress(progress):
+            self.transition['progress'] = progress
 
-            for i, pos in enumerate(square_positions):
-                offset = square_offsets[i]
+        def shrink_done():
+            self.transition = None
+            self.dirty_rects.invalidate()
 
-                amt = 0
-                if(progress > offset + 0.5):
-                    amt = 1.1
-                elif(progress > offset):
-                    amt = translate(progress, offset, offset+0.5, 0, 1.1)
-
-                amtx = amt*xchecksize
-                amty = amt*ychecksize
-                rect = pygame.Rect(pos[0] - (amtx/2), pos[1] - (amty/2), amtx, amty)
-                pygame.draw.rect(self.screen, square_color, rect)
-
-            pygame.display.flip()
+        def grow_done():
+            self.current_scene = scene
+            self.dirty_rects.invalidate()
+            self.log_event("scene", scene=self.scene_names.get(scene, scene))
+            if(self.current_scene == -1):
+                self.transition = None
+                return
+            # Step 5: Shrink checkerboards back down
+            self.transition['snapshot'] = self.snapshot_scene("transition_in")
+            self.transition['growing'] = False
+            self.transition['progress'] = 0
+            self.timeline.tween(transition_duration // 2, set_progress, shrink_done)
 
-        self.current_scene = scene
+        self.timeline.tween(transition_duration // 2, set_progress, grow_done)
 
-        if(self.current_scene != -1):
-            # Step 5: Shrink checkerboards back down
-            shrink_start_time = pygame.time.get_ticks()
-            while pygame.time.get_ticks() - shrink_start_time < transition_duration // 2:
-                self.screen.fill((255, 255, 255))
-                self.scene_manager()
-                
-                progress = ((pygame.time.get_ticks() - shrink_start_time)/(transition_duration / 2))
-                
+    # the scene under the squares is a snapshot, so a transition frame is
+    # one blit plus a fill per visible square
+    def draw_transition(self):
+        square_color = (0, 0, 0)
 
-                for i, pos in enumerate(square_positions):
-                    offset = square_offsets[i]
+        self.screen.blit(self.transition['snapshot'], (0, 0))
+        rects = swipe_rects(self.settings.screen_width, self.settings.screen_height,
+                            self.transition['progress'], self.transition['growing'])
+        for rect in rects[(rects[:, 2] > 0) & (rects[:, 3] > 0)].tolist():
+            self.screen.fill(square_color, rect)
 
-                    amt = 1.1
-                    if(progress > offset + 0.5):
-                        amt = 0
-                    elif(progress > offset):
-                        amt = translate(progress, offset, offset+0.5, 1.1, 0)
+        # the squares cover the whole screen
+        self.dirty_rects.invalidate()
 
-                    amtx = amt*xchecksize
-                    amty = amt*ychecksize
-                    rect = pygame.Rect(pos[0] - (amtx/2), pos[1] - (amty/2), amtx, amty)
-                    pygame.draw.rect(self.screen, square_color, rect)
-                
-                pygame.display.flip()
+    # draw the current scene once and keep it for the transition
+    def snapshot_scene(self, layer):
+        self.screen.fill((255, 255, 255))
+        self.scene_manager()
+        snapshot = self.surface_pool.get(layer, self.screen.get_size(), flags=0)
+        snapshot.blit(self.screen, (0, 0))
+        return snapshot
 
     def draw_nav_arrows(self):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
         # Left arrow
         if(self.current_scene > 1):
             # Set up the left arrow coordinates
@@ -518,65 +591,41 @@ class Game:
     def intro_page(self):
         self._display_intro_text()
         if self.current_line >= len(self.intro_text):
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.mouse
             self.continue_button.draw(self.screen, mouse_x, mouse_y)
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
         self.continue_button.draw(self.screen, mouse_x, mouse_y)
     
     def player_intro_page(self):
         self._display_player_intro_text()
         if self.current_line >= len(self.intro_text):
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.mouse
             self.continue_button.draw(self.screen, mouse_x, mouse_y)
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
         self.continue_button.draw(self.screen, mouse_x, mouse_y)
     
     def player_intro_info(self):
         self._display_info_text()
         if self.current_line >= len(self.intro_text):
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.mouse
             self.continue_button.draw(self.screen, mouse_x, mouse_y)
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
         self.continue_button.draw(self.screen, mouse_x, mouse_y)
     
     def tournament_intro_page(self):
         self._display_tournament_intro_text()
         if self.current_line >= len(self.tournament_intro_text):
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.mouse
             self.continue_button.draw(self.screen, mouse_x, mouse_y)
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
         self.continue_button.draw(self.screen, mouse_x, mouse_y)
 
     def run_league_simluation(self):
-        for p1 in range(self.num_opponents):
-            for p2 in range(self.num_opponents):
-
-                # skip if already calculated
-                if (self.league_results[p1][p2] != -1):
-                    continue
-
-                # simulating p1 vs p2...
-                p1_past_rounds = list()
-                p2_past_rounds = list()
-
-                for r in range(self.num_rounds):
-                    p1_choice = get_computer_choice(p1, p1_past_rounds)
-                    p2_choice = get_computer_choice(p2, p2_past_rounds)
-
-                    self.update_resources(p1_choice, p2_choice)
-                    p1_past_rounds.append((p2_choice, p1_choice))
-                    p2_past_rounds.append((p1_choice, p2_choice))
-
-                # compute payoffs after 5 rounds  
-                p1_payoff = self.compute_payoff("player_resources")
-                p2_payoff = self.compute_payoff("country_resources")
-
-                # store payoffs
-                self.league_results[p1][p2] = p1_payoff
-                self.league_results[p2][p1] = p2_payoff
-
-                # reset data
-                self.format_resources()
+        try:
+            self.league_results = cached_league_matrix(self.engine, self.settings.league_seed)
+        except OSError:
+            # cache not writable, compute in memory
+            self.engine.run_league_simulation(self.league_results, seed=self.settings.league_seed)
 
     def format_resources(self):
         self.player_page_data['player_resources'].lives = 0
@@ -585,134 +634,147 @@ class Game:
         self.player_page_data['country_resources'].resources = 0
 
     def update_resources(self, player_choice, computer_choice):
-        # use nash equilibrium
-        if player_choice == 1 and computer_choice == 1:
-            self.player_page_data['player_resources'].lives -= self.mid_damage
-            self.player_page_data['player_resources'].resources -= self.max_damage
-            self.player_page_data['country_resources'].lives -= 10
-            self.player_page_data['country_resources'].resources -= self.max_damage
-        elif player_choice == 1 and computer_choice == 0:
-            self.player_page_data['player_resources'].resources -= self.max_damage
-            self.player_page_data['country_resources'].lives -= self.max_damage
-        elif player_choice == 0 and computer_choice == 1:
-            self.player_page_data['player_resources'].lives -= 100
-            self.player_page_data['country_resources'].resources -= self.max_damage
-        elif player_choice == 0 and computer_choice == 0:
-            self.player_page_data['player_resources'].lives -= self.min_damage
-            self.player_page_data['player_resources'].resources -= self.mid_damage
-            self.player_page_data['country_resources'].lives -= self.min_damage
-            self.player_page_data['country_resources'].resources -= self.mid_damage
+        self.engine.update_resources(player_choice, computer_choice,
+                                     self.player_page_data['player_resources'],
+                                     self.player_page_data['country_resources'])
 
     def compute_payoff(self, mode):
         if not ((mode == "player_resources") or (mode == "country_resources")):
             raise ValueError("Invalid input for compute_payoff mode")
 
-        return (self.life_weight * self.player_page_data[mode].lives) + (self.resource_weight * self.player_page_data[mode].resources)
+        return self.engine.compute_payoff(self.player_page_data[mode])
 
     def handle_player_events(self, event):
         if(event.type == pygame.MOUSEBUTTONDOWN):
 
-            # print(self.player_page_data['past_matches'])
+            # print(self.player_page_data['history'].count)
             # print(self.player_page_data['match_state'])
 
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.mouse
+            history = self.player_page_data['history']
     
-            if len(self.player_page_data['past_matches']) == self.num_opponents and self.player_page_data['next_button'].is_hover(mouse_x, mouse_y):
+            if len(history) == self.num_opponents and self.player_page_data['next_button'].is_hover(mouse_x, mouse_y):
                 self.swipe_transition(self.current_scene + 1)
             else:
-                if(len(self.player_page_data['past_matches']) < self.num_opponents):
+                if(len(history) < self.num_opponents):
                     if (self.player_page_data['match_state'] == 'waiting'):
                         if(self.player_page_data['use_button'].is_hover(mouse_x, mouse_y) or self.player_page_data['dont_use_button'].is_hover(mouse_x, mouse_y)):
-                            self.player_page_data['match_state'] = 'selected'
-                            self.player_page_data['selected_start_time'] = pygame.time.get_ticks()
-
-                            # for every start of new match, initialize lives and resources to 0
-                            if(len(self.player_page_data['rounds']) == 0):
-                                self.format_resources()
-
-                            # Get both choices
                             # 1 - use ; 0 - not use
-                            player_choice = None
                             if self.player_page_data['use_button'].is_hover(mouse_x, mouse_y):
-                                player_choice = 1
-                            elif self.player_page_data['dont_use_button'].is_hover(mouse_x, mouse_y):
-                                player_choice = 0
-                            self.player_page_data['player_selection'] = player_choice
-                            computer_choice = get_computer_choice(self.player_page_data['current_opponent']['id'], self.player_page_data['rounds'])
-                            self.player_page_data['computer_selection'] = computer_choice
-
-                            self.update_resources(player_choice, computer_choice)
-                            
-                            # Alert the player and computer choices
-                            player_alert_string = "" 
-                            if(player_choice == 1): 
-                                player_alert_string = "Uses AWs!"
-                            else: 
-                                player_alert_string = "Doesn't use AWs!"
-                            computer_alert_string = ""
-                            if(computer_choice == 1):
-                                computer_alert_string = "Uses AWs!"
+                                self.play_round(1)
                             else:
-                                computer_alert_string = "Doesn't use AWs!"
-                            
-                            self.player_page_data['player_selection_alert'] = AlertPanel(player_alert_string, self.player_position[0]-(sprite_size/2), self.player_position[1]-(sprite_size/2), sprite_size*2, (sprite_size/4), self.font)
-                            self.player_page_data['computer_selection_alert'] = AlertPanel(computer_alert_string, self.opponent_position[0]-(sprite_size/2), self.opponent_position[1]-(sprite_size/2), sprite_size*2, (sprite_size/4), self.font)
-
-                            # If attacking with AW, create explode particles
-                            if(player_choice == 1):
-                                self.player_page_data['opponent_attack_particles'] = ExplodeEffect((self.opponent_position[0] + (sprite_size/2), self.opponent_position[1] + (sprite_size/2)), 10, self.rgb_colors["explosion_color"])
-                            if(computer_choice == 1):
-                                self.player_page_data['player_attack_particles'] = ExplodeEffect((self.player_position[0] + (sprite_size/2), self.player_position[1] + (sprite_size/2)), 10, self.rgb_colors["explosion_color"])
-                            
-                            # Save the past round
-                            self.player_page_data['rounds'].append((player_choice, computer_choice))
-                            # when current match is over
-                            if(len(self.player_page_data['rounds']) == self.num_rounds):
-                                # record current match to past_matches array 
-                                self.player_page_data['past_matches'].append(('match {0}'.format(self.player_page_data['current_match'] + 1),self.player_page_data['rounds']))
-                                
-                                # calculate payoffs
-                                player_payoff = self.compute_payoff("player_resources")
-                                computer_payoff = self.compute_payoff("country_resources")
-
-                                # record payoffs 
-                                self.player_page_data['payoffs'].append((player_payoff, computer_payoff))
-                                # record player's game total loss of lives and resources
-                                self.player_page_data['player_lives_lost'] += self.player_page_data['player_resources'].lives
-                                self.player_page_data['player_resources_lost'] += self.player_page_data['player_resources'].resources
-                                # record player's loss of lives and resources for each match
-                                self.player_page_data['player_lives_lost_match'].append(self.player_page_data['player_resources'].lives)
-                                self.player_page_data['player_resources_lost_match'].append(self.player_page_data['player_resources'].resources)
-                                # if not at last opponent
-                                if(len(self.player_page_data['past_matches']) < self.num_opponents):
-                                    self.player_page_data['current_match'] += 1
-                                    self.player_page_data['current_opponent'] = opponents[self.player_page_data['current_match']]
-                                
-                                # if five matches have been completed
-                                else: 
-                                    self.player_page_data['state'] = 'completed'
-                                    # calculate player's result which is the sum of payoffs from 5 matches
-                                    result = 0
-                                    for match in self.player_page_data['payoffs']:
-                                        result += match[0]    
-                                    self.player_page_data['result'] = result
-                                
+                                self.play_round(0)
+
+    # play one round of the 1v1 mode with the player's choice (1 - use ;
+    # 0 - not use); the click handler and the replay both come through here.
+    # A replay can force the opponent's choice with computer_choice.
+    def play_round(self, player_choice, computer_choice=None):
+        self.player_page_data['match_state'] = 'selected'
+        self.player_page_data['selected_start_time'] = pygame.time.get_ticks()
+
+        history = self.player_page_data['history']
+
+        # for every start of new match, initialize lives and resources to 0
+        if(not history.in_match):
+            history.start_match(-1, self.player_page_data['current_match'])
+            self.format_resources()
+            opponent = self.player_page_data['current_opponent']['id']
+            rng = match_rng(self.session_seed, self.player_page_data['current_match'], opponent)
+            self.player_page_data['opponent_strategy'] = make_strategy(opponent, rng)
+
+        self.player_page_data['player_selection'] = player_choice
+        if computer_choice is None:
+            computer_choice = self.player_page_data['opponent_strategy'].choose()
+        self.player_page_data['opponent_strategy'].update(player_choice, computer_choice)
+        self.player_page_data['computer_selection'] = computer_choice
+
+        self.update_resources(player_choice, computer_choice)
+
+        # Alert the player and computer choices
+        player_alert_string = "" 
+        if(player_choice == 1): 
+            player_alert_string = "Uses AWs!"
+        else: 
+            player_alert_string = "Doesn't use AWs!"
+        computer_alert_string = ""
+        if(computer_choice == 1):
+            computer_alert_string = "Uses AWs!"
+        else:
+            computer_alert_string = "Doesn't use AWs!"
+
+        self.player_page_data['player_selection_alert'] = AlertPanel(player_alert_string, self.player_position[0]-(sprite_size/2), self.player_position[1]-(sprite_size/2), sprite_size*2, (sprite_size/4), self.font)
+        self.player_page_data['computer_selection_alert'] = AlertPanel(computer_alert_string, self.opponent_position[0]-(sprite_size/2), self.opponent_position[1]-(sprite_size/2), sprite_size*2, (sprite_size/4), self.font)
+
+        # If attacking with AW, create explode particles
+        if(player_choice == 1):
+            self.player_page_data['opponent_attack_particles'] = ExplodeEffect((self.opponent_position[0] + (sprite_size/2), self.opponent_position[1] + (sprite_size/2)), 10, self.rgb_colors["explosion_color"])
+        if(computer_choice == 1):
+            self.player_page_data['player_attack_particles'] = ExplodeEffect((self.player_position[0] + (sprite_size/2), self.player_position[1] + (sprite_size/2)), 10, self.rgb_colors["explosion_color"])
+
+        # Save the past round
+        history.add_round(player_choice, computer_choice)
+        self.log_event("round", match=self.player_page_data['current_match'], round=history.rounds_played - 1,
+                       opponent=self.player_page_data['current_opponent']['id'],
+                       player_choice=player_choice, computer_choice=computer_choice)
+        # when current match is over
+        if(history.rounds_played == self.num_rounds):
+            # calculate payoffs
+            player_payoff = self.compute_payoff("player_resources")
+            computer_payoff = self.compute_payoff("country_resources")
+
+            # record the match with its payoffs and each side's loss of lives and resources
+            history.finish_match(self.player_page_data['player_resources'], self.player_page_data['country_resources'],
+                                 player_payoff, computer_payoff)
+            self.log_event("match", match=self.player_page_data['current_match'],
+                           opponent=self.player_page_data['current_opponent']['id'],
+                           player_payoff=player_payoff, computer_payoff=computer_payoff,
+                           player_lives=self.player_page_data['player_resources'].lives,
+                           player_resources=self.player_page_data['player_resources'].resources,
+                           computer_lives=self.player_page_data['country_resources'].lives,
+                           computer_resources=self.player_page_data['country_resources'].resources)
+            # record player's game total loss of lives and resources
+            self.player_page_data['player_lives_lost'] += self.player_page_data['player_resources'].lives
+            self.player_page_data['player_resources_lost'] += self.player_page_data['player_resources'].resources
+            # if not at last opponent
+            if(len(history) < self.num_opponents):
+                self.player_page_data['current_match'] += 1
+                self.player_page_data['current_opponent'] = opponents[self.player_page_data['current_match']]
+
+            # if five matches have been completed
+            else: 
+                self.player_page_data['state'] = 'completed'
+                # calculate player's result which is the sum of payoffs from 5 matches
+                self.player_page_data['result'] = float(history.payoffs[:len(history), 0].sum())
+                self.log_event("result", payoff=self.player_page_data['result'],
+                               lives_lost=self.player_page_data['player_lives_lost'],
+                               resources_lost=self.player_page_data['player_resources_lost'])
+
+        # show the alerts for a second, then take the next move
+        self.timeline.after(self.display_time, self.pop_alerts)
+
+    def pop_alerts(self):
+        self.dirty_rects.invalidate()
+        self.player_page_data['match_state'] = 'waiting'
+        self.player_page_data['player_selection_alert'] = None
+        self.player_page_data['computer_selection_alert'] = None
+        self.player_page_data['player_attack_particles'] = None
+        self.player_page_data['opponent_attack_particles'] = None
+
     def draw_player_choices(self):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
 
-        if(self.player_page_data['match_state'] == 'waiting' and len(self.player_page_data['past_matches']) < self.num_opponents):
+        if(self.player_page_data['match_state'] == 'waiting' and len(self.player_page_data['history']) < self.num_opponents):
             self.player_page_data['use_button'].draw(self.screen, mouse_x, mouse_y)
             self.player_page_data['dont_use_button'].draw(self.screen, mouse_x, mouse_y)
-            pygame.display.flip()
 
     def player_page(self):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
         self.player_page_data['smoke_background']['active'] = False #temp fix @solina
 
         if(self.player_page_data['smoke_background']['active']):
             self.player_page_data['smoke_background']['smoke'].draw(self.screen)
 
-        text_surface = self.font.render(f"Match {self.player_page_data['current_match'] + 1}", True, (0, 0, 0))
+        text_surface = render_text(self.font, f"Match {self.player_page_data['current_match'] + 1}", True, (0, 0, 0))
         text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, self.settings.screen_height // 4))
         self.screen.blit(text_surface, text_rect)
 
@@ -721,28 +783,24 @@ class Game:
         y_step = y_spread/4
         y_start = (self.settings.screen_height//2)-(y_spread/2)
 
+        # a finished match stays on screen until its alerts are gone
+        history = self.player_page_data['history']
+        rounds_shown = history.rounds_played if history.in_match or self.player_page_data['match_state'] == 'selected' else 0
         for i in range(self.num_rounds):
             circ_pos = (center_x, y_start)
-            try:
-                if(self.player_page_data['rounds'][i]):
-                    pygame.draw.circle(self.screen, (50, 50, 50), circ_pos, 20, 0)
-                    
-                    
-            except:
+            if(i < rounds_shown):
+                pygame.draw.circle(self.screen, (50, 50, 50), circ_pos, 20, 0)
+            else:
                 pygame.draw.circle(self.screen, (50, 50, 50), circ_pos, 20, 3)
 
             y_start += y_step
         
-        # reset rounds array
-        if (len(self.player_page_data['rounds']) == self.num_rounds):
-            self.player_page_data['rounds'] = []
-        
         # Find player and opponent positions
         self.player_position = ((self.settings.screen_width/4) - (sprite_size/2), (self.settings.screen_height/2) - (sprite_size/2))
         self.opponent_position = ((3*self.settings.screen_width/4) - (sprite_size/2), (self.settings.screen_height/2) - (sprite_size/2))
 
         # Create shadow surface
-        shadow_surface = pygame.Surface((3*sprite_size/4, sprite_size/4), pygame.SRCALPHA)
+        shadow_surface = self.surface_pool.get("shadow", (3*sprite_size/4, sprite_size/4))
         pygame.draw.ellipse(shadow_surface, (50, 50, 50), shadow_surface.get_rect())
 
         # Draw the shadows
@@ -750,19 +808,19 @@ class Game:
         self.screen.blit(shadow_surface, (self.player_position[0]+(sprite_size/8), shadow_y))
         self.screen.blit(shadow_surface, (self.opponent_position[0]+(sprite_size/8), shadow_y))
     
-        self.screen.blit(player_sprite, self.player_position)
-        self.screen.blit(self.player_page_data['current_opponent']['sprite'], self.opponent_position)
+        self.screen.blit(get_sprite(player_image), self.player_position)
+        self.screen.blit(get_sprite(self.player_page_data['current_opponent']['image']), self.opponent_position)
 
         self.player_page_data['player_resources'].draw(self.screen)
         self.player_page_data['country_resources'].draw(self.screen)
 
         # display user's name
-        text_surface = self.font.render(self.player_name, True, (50, 50, 50))
+        text_surface = render_text(self.font, self.player_name, True, (50, 50, 50))
         self.screen.blit(text_surface, (self.player_position[0]+(sprite_size/2.5), shadow_y +(sprite_size/2.5)))
 
         # display opponent name
         name = self.player_page_data['current_opponent']['name']
-        text_surface = self.font.render(name, True, (50, 50, 50))
+        text_surface = render_text(self.font, name, True, (50, 50, 50))
         self.screen.blit(text_surface, (self.opponent_position[0]+(sprite_size/2.5), shadow_y +(sprite_size/2.5)))
 
 
@@ -782,19 +840,6 @@ class Game:
             if(self.player_page_data['opponent_attack_particles'] != None):
                 if(self.player_page_data['opponent_attack_particles'].active):
                     self.player_page_data['opponent_attack_particles'].draw(self.screen)
-                    
-            
-            # update the screen & display for 1.5 seconds
-            pygame.display.flip()  
-            pygame.time.wait(1000)
-
-            # pop alert panel
-            self.player_page_data['match_state'] = 'waiting'
-            self.player_page_data['player_selection_alert'] = None
-            self.player_page_data['computer_selection_alert'] = None
-            self.player_page_data['player_attack_particles'] = None
-            self.player_page_data['opponent_attack_particles'] = None
-            self.draw_player_choices()
 
 
         else:
@@ -806,13 +851,13 @@ class Game:
                 self.player_page_data['computer_selection_alert'] = None
     
 
-        if(len(self.player_page_data['past_matches']) == self.num_opponents):
+        if(len(self.player_page_data['history']) == self.num_opponents):
             self.player_page_data['next_button'].draw(self.screen, mouse_x, mouse_y)                
 
     def handle_explanation_events(self, event):
         if(event.type == pygame.MOUSEBUTTONDOWN):
 
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.mouse
             if self.tournament_page_data['instruction_panel']['panel'].active:
                 self.tournament_page_data['instruction_panel']['panel'].active = False
             elif self.tournament_page_data['next_button'].is_hover(mouse_x, mouse_y):
@@ -821,11 +866,8 @@ class Game:
 
     def explanation_page(self):
         # Define the text to display
-
-        font_path = os.path.join("assets", "fonts", "PixelOperatorSC-Bold.ttf")
-        self.font = pygame.font.Font(font_path, 20)
         # Render the text
-        text_surface = self.font.render("Your payoff score is: ", True, (0,0,0))
+        text_surface = render_text(self.font, "Your payoff score is: ", True, (0,0,0))
 
 
         # Draw the text on the screen surface
@@ -835,26 +877,25 @@ class Game:
         y_offset = 100
         for key, values in self.results_page_data.items():
             for value in values:
-                explanation_surface = self.font.render(value, True, (0, 0, 0))
+                explanation_surface = render_text(self.font, value, True, (0, 0, 0))
                 explanation_rect = explanation_surface.get_rect(center=(self.settings.screen_width // 2, y_offset))
                 self.screen.blit(explanation_surface, explanation_rect)
                 y_offset += 30
             y_offset += 20
     
     def handle_tournament_events(self, event):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
 
         if(event.type == pygame.MOUSEBUTTONDOWN):
             if self.tournament_page_data['next_button'].is_hover(mouse_x, mouse_y):
                 self.tournament_page_data['current_match'] += 1
                 if (self.tournament_page_data['current_match'] >= len(self.tournament_page_data['round_data'])):
                     self.change_scene(self.current_scene + 1)
-                    pygame.time.wait(1000)
 
     def tournament_page(self):
 
         # Render the text
-        text_surface = self.font.render("Tournament Mode", True, (0,0,0))
+        text_surface = render_text(self.font, "Tournament Mode", True, (0,0,0))
         text_rect = text_surface.get_rect(center=(self.settings.screen_width * 0.5, 30))
         self.screen.blit(text_surface, text_rect)
 
@@ -871,21 +912,21 @@ class Game:
         self.draw_tournament_sprites()
         self.draw_tournament_lines(p1,p2)
 
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
         self.tournament_page_data['next_button'].draw(self.screen, mouse_x, mouse_y)
 
         self.tournament_results(p1,p2)
     
     def draw_tournament_sprites(self):
-        sprite = opponents[0]['sprite']
+        sprite = get_sprite(opponents[0]['image'])
         self.screen.blit(sprite, (340, 60))  # Draw the sprite at the top-left corner of the screen
-        sprite = opponents[1]['sprite']
+        sprite = get_sprite(opponents[1]['image'])
         self.screen.blit(sprite, (170, 150))
-        sprite = opponents[2]['sprite']
+        sprite = get_sprite(opponents[2]['image'])
         self.screen.blit(sprite, (520, 150))
-        sprite = opponents[3]['sprite']
+        sprite = get_sprite(opponents[3]['image'])
         self.screen.blit(sprite, (250, 280))
-        sprite = opponents[4]['sprite']
+        sprite = get_sprite(opponents[4]['image'])
         self.screen.blit(sprite, (450, 280))
          
     def draw_tournament_lines(self, p1, p2):
@@ -914,21 +955,21 @@ class Game:
         payoff_data = " ".join([str(p1_payoff), 'vs', str(p2_payoff)])
         round_data = self.tournament_page_data['round_data'][current_match]
 
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.mouse
 
-        text1 = self.font.render(round_data, True, self.rgb_colors["black"])
-        text2 = self.font.render(payoff_data, True, self.rgb_colors["dark_green"])
+        text1 = render_text(self.font, round_data, True, self.rgb_colors["black"])
+        text2 = render_text(self.font, payoff_data, True, self.rgb_colors["dark_green"])
         self.screen.blit(text1, text1.get_rect(center=(self.settings.screen_width // 2, self.settings.screen_height * 0.75)))
         self.screen.blit(text2, text2.get_rect(center=(self.settings.screen_width // 2, self.settings.screen_height * 0.80)))
 
     def payoff_page(self):
         
-        text_surface = self.font.render("So the winner is… DEVELOPING!", True, (0, 0, 180))
+        text_surface = render_text(self.font, "So the winner is… DEVELOPING!", True, (0, 0, 180))
         text_rect = text_surface.get_rect()
         text_rect.center = (400, 100)
         self.screen.blit(text_surface, text_rect)
 
-        text_surface = self.font.render("This persona had the best payoff score of 425.7.", True, (0, 0, 0))
+        text_surface = render_text(self.font, "This persona had the best payoff score of 425.7.", True, (0, 0, 0))
         text_rect = text_surface.get_rect()
         text_rect.center = (400, 130)
         self.screen.blit(text_surface, text_rect)
@@ -938,7 +979,7 @@ class Game:
 
             # Render the text for the value
             for i, line in enumerate(value):
-                text_surface = self.font.render(line, True, (0,0,0))
+                text_surface = render_text(self.font, line, True, (0,0,0))
                 text_rect = text_surface.get_rect(center=(self.settings.screen_width // 2, y_offset + i*2))
                 self.screen.blit(text_surface, text_rect)
 
@@ -947,21 +988,21 @@ class Game:
     def takeaways_page(self):
 
             # Render the text
-            text_surface = self.font.render("Key Takeaways", True, (0,0,0))
+            text_surface = render_text(self.font, "Key Takeaways", True, (0,0,0))
             text_rect = text_surface.get_rect(center=(self.settings.screen_width * 0.5, 30))
             self.screen.blit(text_surface, text_rect)
 
             # Display takeaway data
             takeaway_y_pos = 50
             for takeaway_number, takeaway_text in self.takeaway_data.items():
-                takeaway_number_surface = self.font.render(f"Takeaway {takeaway_number}: ", True, (160,0,0))
+                takeaway_number_surface = render_text(self.font, f"Takeaway {takeaway_number}: ", True, (160,0,0))
                 takeaway_number_rect = takeaway_number_surface.get_rect(top=takeaway_y_pos,left=30)
                 self.screen.blit(takeaway_number_surface, takeaway_number_rect)
 
                 takeaway_y_pos += 30
 
                 for line in takeaway_text:
-                    takeaway_surface = self.font.render(line, True, (0,0,0))
+                    takeaway_surface = render_text(self.font, line, True, (0,0,0))
                     takeaway_rect = takeaway_surface.get_rect(top=takeaway_y_pos,left=30)
                     self.screen.blit(takeaway_surface, takeaway_rect)
 
@@ -969,17 +1010,17 @@ class Game:
                 takeaway_y_pos += 10
 
     def credits_page(self):
-        text_surface = self.font.render("Credits", True, (0, 0, 0))
+        text_surface = render_text(self.font, "Credits", True, (0, 0, 0))
         text_rect = text_surface.get_rect()
         text_rect.center = (380, 100)
         self.screen.blit(text_surface, text_rect)
 
-        text_surface = self.font.render("SVS Tech Ethics, Spring 2023", True, (0, 0, 0))
+        text_surface = render_text(self.font, "SVS Tech Ethics, Spring 2023", True, (0, 0, 0))
         text_rect = text_surface.get_rect()
         text_rect.center = (380, 200)
         self.screen.blit(text_surface, text_rect)
 
-        text_surface = self.font.render("Creators: Tram, Sam, Roy, Yewon, Solina", True, (0, 0, 0))
+        text_surface = render_text(self.font, "Creators: Tram, Sam, Roy, Yewon, Solina", True, (0, 0, 0))
         text_rect = text_surface.get_rect()
         text_rect.center = (380, 250)
         self.screen.blit(text_surface, text_rect)
\ No newline at end of file
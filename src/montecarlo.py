@@ -0,0 +1,103 @@
+# src/montecarlo.py
+#
+# Monte Carlo league for stochastic strategies. Every pairing that involves a
+# strategy with random moves is played repetitions times. Each pairing gets
+# its own child of one SeedSequence and each repetition its own stream from
+# that child, so results are reproducible from the seed and independent of
+# how the work is split. All repetitions are played together as rows of the
+# batch simulator, split over worker processes. Deterministic pairings are
+# played once.
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from src.engine import Engine
+from src.strategies import is_stochastic
+from src.tournament import league_pairs, pair_matrix, pair_payoffs, play_seeded
+
+# rows of the batch simulator per call, bounds memory for large leagues
+DEFAULT_BATCH_ROWS = 1 << 20
+
+class MonteCarloResult:
+    def __init__(self, engine, repetitions, confidence, mean, std, samples):
+        self.engine = engine
+        self.repetitions = repetitions
+        self.confidence = confidence
+        # (N, N) mean payoff and sample standard deviation, laid out like league_results
+        self.mean = mean
+        self.std = std
+        # (N, N) number of matches behind each entry (1 for deterministic pairings)
+        self.samples = samples
+
+    # half width of the normal confidence interval of the mean
+    def half_width(self):
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        return z * self.std / np.sqrt(self.samples)
+
+    def ci_low(self):
+        return self.mean - self.half_width()
+
+    def ci_high(self):
+        return self.mean + self.half_width()
+
+# mean and sample standard deviation of both sides for the pairings p1, p2,
+# playing reps[k] repetitions from children[k]
+def play_batch(engine, strategies, p1, p2, reps, children):
+    seeds = np.concatenate([child.generate_state(int(count), np.uint64) for child, count in zip(children, reps)])
+    pairs = np.arange(len(p1))
+    rows = np.repeat(pairs, reps)
+
+    outcome_counts, _ = play_seeded(strategies, p1[rows], p2[rows], seeds, engine.num_rounds)
+    p1_payoff, p2_payoff = pair_payoffs(engine, outcome_counts)
+
+    # rows of a pairing are contiguous, reduce them per pairing
+    offsets = np.concatenate([[0], np.cumsum(reps)[:-1]])
+    many = reps > 1
+    results = []
+    for payoff in (p1_payoff, p2_payoff):
+        mean = np.add.reduceat(payoff, offsets) / reps
+        squares = np.add.reduceat((payoff - np.repeat(mean, reps)) ** 2, offsets)
+        std = np.zeros(len(p1))
+        std[many] = np.sqrt(squares[many] / (reps[many] - 1))
+        results += [mean, std]
+    return results
+
+def _play_batch_job(job):
+    return play_batch(*job)
+
+def run_monte_carlo(engine=None, repetitions=100, seed=None, confidence=0.95, batch_rows=DEFAULT_BATCH_ROWS,
+                    workers=1):
+    engine = engine or Engine()
+    if repetitions < 1:
+        raise ValueError("repetitions must be at least 1")
+    strategies = np.asarray(engine.strategies, dtype=np.intp)
+    num_players = len(strategies)
+    p1, p2 = league_pairs(num_players)
+
+    stochastic = np.array([is_stochastic(int(strategy)) for strategy in strategies], dtype=bool)
+    random_pair = stochastic[p1] | stochastic[p2]
+    reps = np.where(random_pair, repetitions, 1)
+
+    # one child SeedSequence per pairing, one uint64 stream seed per repetition
+    root = np.random.SeedSequence(seed)
+    children = root.spawn(len(p1))
+
+    # batches of whole pairings; a pairing's streams only depend on its child,
+    # so the result is the same whichever worker plays it
+    pairs_per_batch = max(1, batch_rows // repetitions)
+    jobs = [(engine, strategies, p1[start:start + pairs_per_batch], p2[start:start + pairs_per_batch],
+             reps[start:start + pairs_per_batch], children[start:start + pairs_per_batch])
+            for start in range(0, len(p1), pairs_per_batch)]
+
+    if workers == 1 or len(jobs) == 1:
+        parts = [_play_batch_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_play_batch_job, jobs))
+    p1_mean, p1_std, p2_mean, p2_std = (np.concatenate(column) for column in zip(*parts))
+
+    mean = pair_matrix(num_players, p1, p2, p1_mean, p2_mean)
+    std = pair_matrix(num_players, p1, p2, p1_std, p2_std)
+    samples = pair_matrix(num_players, p1, p2, reps, reps)
+    return MonteCarloResult(engine, repetitions, confidence, mean, std, samples)
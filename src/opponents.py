@@ -0,0 +1,44 @@
+# src/opponents.py
+#
+# The opponents of the 1v1 mode: persona, strategy, sprite and name. Kept
+# free of pygame so the headless tools (e.g. src/analytics.py) name the
+# opponents the same way the game does; src/sprites.py re-exports it.
+from src.strategies import get_strategy
+
+opponents = [
+    {
+        "id": 0,
+        "type": "Developed Country",
+        "strategy": get_strategy(0).label,
+        "image": "DevelopedCountry.png",
+        "name": "Joe"
+    },
+    {
+        "id": 1,
+        "type": "Developing Country",
+        "strategy": get_strategy(1).label,
+        "image": "DevelopingCountry.png",
+        "name": "Kanye"
+    },
+    {
+        "id": 2,
+        "type": "Resource-Rich Country",
+        "strategy": get_strategy(2).label,
+        "image": "ResourceRich.png",
+        "name": "Sam"
+    },
+    {
+        "id": 3,
+        "type": "Military-Focused Country",
+        "strategy": get_strategy(3).label,
+        "image": "MilitaryFocused.png",
+        "name": "Lizzy"
+    },
+    {
+        "id": 4,
+        "type": "Peace-Focused Country",
+        "strategy": get_strategy(4).label,
+        "image": "PeaceFocused.png",
+        "name": "Dierre"
+    },
+]
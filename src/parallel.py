@@ -0,0 +1,88 @@
+# src/parallel.py
+#
+# Process-pool mode for large leagues. The upper triangle of the N x N
+# pairing matrix is cut into square tiles, each tile is played by
+# tournament.play_pairs on a worker, and the tallies are merged back into one
+# TournamentResult. Per-pair seeding keeps the result independent of the
+# number of workers and of the tile size.
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.engine import Engine
+from src.tournament import NUM_OUTCOMES, TournamentResult, play_pairs, random_seed
+
+DEFAULT_TILE_SIZE = 256
+
+# (row_start, row_end, col_start, col_end) of the tiles on or above the diagonal
+def league_tiles(num_players, tile_size=DEFAULT_TILE_SIZE):
+    tiles = []
+    for row_start in range(0, num_players, tile_size):
+        for col_start in range(row_start, num_players, tile_size):
+            tiles.append((row_start, min(row_start + tile_size, num_players),
+                          col_start, min(col_start + tile_size, num_players)))
+    return tiles
+
+# pairs (p1, p2) of one tile with p1 <= p2
+def tile_pairs(tile):
+    row_start, row_end, col_start, col_end = tile
+    p1, p2 = np.meshgrid(np.arange(row_start, row_end, dtype=np.intp),
+                         np.arange(col_start, col_end, dtype=np.intp), indexing="ij")
+    keep = p1 <= p2
+    return p1[keep], p2[keep]
+
+def play_tile(strategies, num_rounds, seed, tile):
+    p1, p2 = tile_pairs(tile)
+    outcome_counts, _ = play_pairs(strategies, p1, p2, num_rounds, seed)
+    return p1, p2, outcome_counts
+
+def _play_tile_job(job):
+    return play_tile(*job)
+
+def _play_pairs_job(job):
+    return play_pairs(*job)[0]
+
+def default_workers():
+    return os.cpu_count() or 1
+
+# Outcome counts of arbitrary pairs (p1[k], p2[k]), e.g. the pairings missing
+# from a cached league, in chunks of tile_size**2 pairs on a process pool.
+# Same counts as play_pairs(strategies, p1, p2, num_rounds, seed).
+def play_pairs_parallel(strategies, p1, p2, num_rounds, seed, workers=None, tile_size=DEFAULT_TILE_SIZE):
+    workers = workers or default_workers()
+    strategies = np.asarray(strategies)
+    chunk = tile_size * tile_size
+    jobs = [(strategies, p1[start:start + chunk], p2[start:start + chunk], num_rounds, seed)
+            for start in range(0, len(p1), chunk)]
+
+    if workers == 1 or len(jobs) <= 1:
+        parts = [_play_pairs_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_play_pairs_job, jobs))
+    if not parts:
+        return np.zeros((0, NUM_OUTCOMES), dtype=np.int64)
+    return np.concatenate(parts)
+
+# same result as tournament.play_tournament(engine, seed) for any workers/tile_size
+def play_tournament_parallel(engine=None, seed=None, workers=None, tile_size=DEFAULT_TILE_SIZE):
+    engine = engine or Engine()
+    if seed is None:
+        seed = random_seed()
+    workers = workers or default_workers()
+
+    strategies = np.asarray(engine.strategies)
+    jobs = [(strategies, engine.num_rounds, seed, tile)
+            for tile in league_tiles(len(strategies), tile_size)]
+
+    if workers == 1 or len(jobs) == 1:
+        parts = [_play_tile_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_play_tile_job, jobs))
+
+    p1 = np.concatenate([part[0] for part in parts])
+    p2 = np.concatenate([part[1] for part in parts])
+    outcome_counts = np.concatenate([part[2] for part in parts])
+    return TournamentResult(engine, p1, p2, outcome_counts)
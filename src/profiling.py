@@ -0,0 +1,203 @@
+# src/profiling.py
+#
+# Timing helpers. Only the standard library is imported here, so the startup
+# profile can time the import of pygame and the game modules themselves.
+import collections
+import csv
+import json
+import platform
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+# peak resident memory of this process in bytes, None if unknown
+def peak_memory():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+# resident memory of this process right now in bytes; falls back to the peak
+# where /proc is not available
+def current_memory():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except (OSError, AttributeError):
+        return peak_memory()
+
+# Cold-start phases as consecutive checkpoints: mark(name) closes the phase
+# that started at the previous mark (or at construction).
+class StartupProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+        # extra sections of the report, e.g. font load times
+        self.info = {}
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append({
+            "name": name,
+            "start_ms": (self.last - self.started) * 1000,
+            "ms": (now - self.last) * 1000,
+        })
+        self.last = now
+
+    def report(self):
+        report = {
+            "total_ms": (self.last - self.started) * 1000,
+            "phases": self.phases,
+            "modules_loaded": len(sys.modules),
+            "peak_memory_bytes": peak_memory(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        }
+        report.update(self.info)
+        return report
+
+    # path "-" writes to stdout
+    def write(self, path):
+        report = self.report()
+        if path == "-":
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            with open(path, "w") as output:
+                json.dump(report, output, indent=2)
+        return report
+
+# columns of a frame trace; sections that did not run in a frame are 0
+TRACE_FIELDS = ("frame", "scene", "frame_ms", "events_ms", "timeline_ms", "draw_ms",
+                "scene_ms", "present_ms", "alloc_bytes", "text_misses")
+
+# upper edges (ms) of the frame-time histogram buckets
+HISTOGRAM_EDGES = (1, 2, 4, 8, 16.7, 33.3, 50, 100, float("inf"))
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)]
+
+class _Section:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name + "_ms"
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000)
+
+# Per-scene frame timing. A frame runs from one begin_frame to the next, so
+# frame_ms includes the time spent waiting in clock.tick. Every scene keeps a
+# rolling window of its last frames (window=None keeps them all); with
+# tracing on every frame is also kept as a row of TRACE_FIELDS for export.
+class FrameProfiler:
+    def __init__(self, window=600, max_trace=100000):
+        self.window = window
+        self.max_trace = max_trace
+        self.scenes = {}
+        self.trace = None
+        self.frame = 0
+        self.scene = None
+        self.started = None
+        self.current = {}
+        self.sections = {}
+
+    def enable_trace(self):
+        self.trace = collections.deque(maxlen=self.max_trace)
+
+    def begin_frame(self, scene):
+        now = time.perf_counter()
+        self.end_frame(now)
+        self.scene = scene
+        self.started = now
+        self.current = {}
+
+    def end_frame(self, now=None):
+        if self.started is None:
+            return
+        now = time.perf_counter() if now is None else now
+        self.current["frame_ms"] = (now - self.started) * 1000
+        self.started = None
+
+        window = self.scenes.get(self.scene)
+        if window is None:
+            window = self.scenes[self.scene] = {
+                field: collections.deque(maxlen=self.window) for field in TRACE_FIELDS[2:]
+            }
+        for field, values in window.items():
+            values.append(self.current.get(field, 0))
+
+        if self.trace is not None:
+            row = {field: self.current.get(field, 0) for field in TRACE_FIELDS}
+            row.update(frame=self.frame, scene=self.scene)
+            self.trace.append(row)
+        self.frame += 1
+
+    # time the body of a with block as <name>_ms of the current frame
+    def section(self, name):
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self, name)
+        return section
+
+    def add(self, field, value):
+        self.current[field] = self.current.get(field, 0) + value
+
+    # frame counts per HISTOGRAM_EDGES bucket over the scene's window
+    def histogram(self, scene, field="frame_ms"):
+        counts = [0] * len(HISTOGRAM_EDGES)
+        for value in self.scenes.get(scene, {}).get(field, ()):
+            for i, edge in enumerate(HISTOGRAM_EDGES):
+                if value <= edge:
+                    counts[i] += 1
+                    break
+        return counts
+
+    def summary(self, scene):
+        window = self.scenes.get(scene)
+        if not window or not window["frame_ms"]:
+            return None
+        frame_ms = list(window["frame_ms"])
+        draw_ms = list(window["draw_ms"])
+        mean = sum(frame_ms) / len(frame_ms)
+        return {
+            "frames": len(frame_ms),
+            "fps": 1000 / mean if mean > 0 else 0.0,
+            "frame_p50_ms": percentile(frame_ms, 50),
+            "frame_p99_ms": percentile(frame_ms, 99),
+            "draw_p50_ms": percentile(draw_ms, 50),
+            "draw_p99_ms": percentile(draw_ms, 99),
+            "alloc_bytes": sum(window["alloc_bytes"]),
+            "text_misses": sum(window["text_misses"]),
+            "histogram": self.histogram(scene),
+        }
+
+    # .csv writes the frame rows, anything else JSON with the per-scene
+    # summaries and the rows
+    def write_trace(self, path):
+        rows = list(self.trace or ())
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as output:
+                writer = csv.DictWriter(output, fieldnames=TRACE_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w") as output:
+                json.dump({
+                    "histogram_edges_ms": [edge if edge != float("inf") else None for edge in HISTOGRAM_EDGES],
+                    "scenes": {str(scene): self.summary(scene) for scene in self.scenes},
+                    "frames": rows,
+                }, output, indent=1)
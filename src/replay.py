@@ -0,0 +1,296 @@
+# src/replay.py
+#
+# Deterministic replay of recorded 1v1 sessions (the telemetry logs of
+# src/telemetry.py). The player's choices are played back against the same
+# strategy objects, seeded from the session seed like in the game, through
+# Engine.update_resources and Engine.compute_payoff:
+#
+#   python -m src.replay logs/ --workers 8                # headless, max speed
+#   python -m src.replay logs/ --max-damage 150           # with changed constants
+#   python -m src.replay logs/<session>-0000.jsonl --render 4
+#   python -m src.replay logs/<session>-0000.jsonl --render 1 --frames frames/
+#
+# Headless replays never import pygame and report every session whose
+# opponent moves or result came out differently from the recording. --render
+# plays one session in the game window at a speed multiple; with --frames it
+# runs under the dummy video driver as fast as it can and saves every frame
+# as a PNG for a highlight video.
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.analytics import log_files
+from src.engine import Engine, Score, match_rng
+from src.parallel import default_workers
+from src.strategies import make_strategy
+from src.sweep import PARAMETERS
+
+# sessions replayed by one worker job
+DEFAULT_BATCH = 64
+
+class RecordedSession:
+    def __init__(self, session):
+        self.session = session
+        # None for logs written before sessions were seeded; their opponent
+        # moves can only be taken from the recording
+        self.seed = None
+        # engine constants the session was played with
+        self.config = {}
+        # (match, opponent, player_choice, computer_choice) in play order
+        self.rounds = []
+        # match -> recorded (player_payoff, computer_payoff)
+        self.match_payoffs = {}
+        self.result = None
+
+    def add(self, event):
+        kind = event.get("event")
+        if kind == "session":
+            self.seed = event.get("seed")
+            self.config = {name: event[name] for name in ("num_rounds",) + PARAMETERS if name in event}
+        elif kind == "round":
+            self.rounds.append((event["match"], event["opponent"], event["player_choice"], event["computer_choice"]))
+        elif kind == "match":
+            self.match_payoffs[event["match"]] = (event["player_payoff"], event["computer_payoff"])
+        elif kind == "result":
+            self.result = event["payoff"]
+
+    # the recorded constants with overrides (PARAMETERS names) applied
+    def engine(self, **overrides):
+        config = dict(self.config)
+        config.update(overrides)
+        return Engine(**config)
+
+    # [(match, opponent, [(player_choice, computer_choice), ...]), ...]
+    def matches(self):
+        matches = []
+        for match, opponent, player_choice, computer_choice in self.rounds:
+            if not matches or matches[-1][0] != match:
+                matches.append((match, opponent, []))
+            matches[-1][2].append((player_choice, computer_choice))
+        return matches
+
+# the sessions logged in files, in the order they were written
+def read_sessions(files):
+    sessions = {}
+    for path in files:
+        with open(path, "rb") as log:
+            for line in log:
+                try:
+                    event = json.loads(line)
+                    session = sessions.get(event["session"])
+                    if session is None:
+                        session = sessions[event["session"]] = RecordedSession(event["session"])
+                    session.add(event)
+                except (ValueError, KeyError, TypeError):
+                    # e.g. a line cut short when the kiosk lost power
+                    continue
+    return list(sessions.values())
+
+# log files grouped per session, from the <session>-<part>.jsonl names
+def session_files(paths):
+    groups = {}
+    for path in log_files(paths):
+        name = os.path.basename(path).rsplit("-", 1)[0]
+        groups.setdefault(name, []).append(path)
+    return [sorted(files) for _, files in sorted(groups.items())]
+
+# Play the recorded player choices back. recorded_moves takes the opponent's
+# moves from the log instead of its strategy, which is what sessions without
+# a seed fall back to.
+def replay_session(recorded, overrides=None, recorded_moves=False):
+    engine = recorded.engine(**(overrides or {}))
+    recorded_moves = recorded_moves or recorded.seed is None
+    matches = []
+    changed_moves = 0
+    for match, opponent, rounds in recorded.matches():
+        strategy = None if recorded_moves else make_strategy(opponent, match_rng(recorded.seed, match, opponent))
+        player, computer = Score(), Score()
+        for player_choice, recorded_choice in rounds:
+            if strategy is None:
+                computer_choice = recorded_choice
+            else:
+                computer_choice = strategy.choose()
+                strategy.update(player_choice, computer_choice)
+                changed_moves += computer_choice != recorded_choice
+            engine.update_resources(player_choice, computer_choice, player, computer)
+        matches.append({
+            "match": match,
+            "opponent": opponent,
+            "player_payoff": engine.compute_payoff(player),
+            "computer_payoff": engine.compute_payoff(computer),
+            "recorded": recorded.match_payoffs.get(match),
+        })
+
+    result = sum(match["player_payoff"] for match in matches)
+    return {
+        "session": recorded.session,
+        "rounds": len(recorded.rounds),
+        "seeded": recorded.seed is not None,
+        "changed_moves": changed_moves,
+        "result": result,
+        "recorded_result": recorded.result,
+        # the session was finished and came out differently
+        "changed_result": recorded.result is not None and abs(result - recorded.result) > 1e-9,
+        "matches": matches,
+    }
+
+def replay_files(groups, overrides=None, recorded_moves=False):
+    results = []
+    for files in groups:
+        for recorded in read_sessions(files):
+            results.append(replay_session(recorded, overrides, recorded_moves))
+    return results
+
+def _replay_job(job):
+    return replay_files(*job)
+
+# replay every session under paths on a process pool; yields the per-session
+# results as the batches finish
+def replay_logs(paths, overrides=None, workers=None, recorded_moves=False, batch=DEFAULT_BATCH):
+    groups = session_files(paths)
+    if not groups:
+        raise ValueError("No telemetry logs to replay")
+    workers = workers or default_workers()
+    jobs = [(groups[i:i + batch], overrides, recorded_moves) for i in range(0, len(groups), batch)]
+
+    if workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            yield from _replay_job(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_replay_job, jobs):
+                yield from results
+
+# Play one session in the game at speed times real time. With frames_dir
+# every frame is saved there and nothing waits on the clock.
+def render_session(recorded, speed=1.0, frames_dir=None, idle_ms=2000):
+    if frames_dir is not None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.makedirs(frames_dir, exist_ok=True)
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    from src.game import Game
+
+    pygame.init()
+    game = Game(seed=recorded.seed)
+    # straight to the 1v1 page
+    game.current_scene = 3
+    frame_ms = 1000 / game.settings.fps
+    frames = 0
+
+    def step():
+        nonlocal frames
+        if frames_dir is None:
+            game.frame(game.clock.get_time() * speed)
+            game.clock.tick(game.settings.fps)
+        else:
+            game.frame(frame_ms * speed)
+            pygame.image.save(game.screen, os.path.join(frames_dir, f"frame-{frames:06d}.png"))
+        frames += 1
+        return game.running
+
+    def ready():
+        return game.transition is None and game.player_page_data['match_state'] == 'waiting'
+
+    if step():
+        for match, opponent, rounds in recorded.matches():
+            for player_choice, computer_choice in rounds:
+                while game.running and not ready():
+                    step()
+                if not game.running:
+                    break
+                # the log's opponent moves stand in for an unseeded strategy
+                game.play_round(player_choice, computer_choice if recorded.seed is None else None)
+                step()
+        # hold the last screen for a moment
+        shown = 0
+        while game.running and shown < idle_ms * speed:
+            step()
+            shown += frame_ms * speed
+    pygame.quit()
+    return frames
+
+def print_summary(summary, output=sys.stderr):
+    print(f"replay: {summary['sessions']} sessions, {summary['rounds']} rounds in {summary['seconds']:.3f}s "
+          f"({summary['sessions'] / summary['seconds'] if summary['seconds'] > 0 else float('inf'):,.0f} sessions/sec)",
+          file=output)
+    print(f"{summary['changed_moves']} sessions with different opponent moves, "
+          f"{summary['changed_results']} finished sessions with a different result "
+          f"(mean change {summary['mean_result_change']:.2f}, max {summary['max_result_change']:.2f}), "
+          f"{summary['unseeded']} unseeded sessions replayed with their recorded moves", file=output)
+
+def run_replay(args, overrides):
+    start = time.perf_counter()
+    summary = {"sessions": 0, "rounds": 0, "changed_moves": 0, "changed_results": 0, "unseeded": 0,
+               "mean_result_change": 0.0, "max_result_change": 0.0}
+    total_change = 0.0
+    finished = 0
+    output = open(args.output, "w") if args.output else None
+    try:
+        for result in replay_logs(args.logs, overrides, args.workers, args.recorded_moves):
+            summary["sessions"] += 1
+            summary["rounds"] += result["rounds"]
+            summary["changed_moves"] += result["changed_moves"] > 0
+            summary["changed_results"] += result["changed_result"]
+            summary["unseeded"] += not result["seeded"]
+            if result["recorded_result"] is not None:
+                change = abs(result["result"] - result["recorded_result"])
+                total_change += change
+                finished += 1
+                summary["max_result_change"] = max(summary["max_result_change"], change)
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not None:
+            output.close()
+    summary["mean_result_change"] = total_change / finished if finished else 0.0
+    summary["seconds"] = time.perf_counter() - start
+    print_summary(summary)
+    if args.check and (summary["changed_moves"] or summary["changed_results"]):
+        sys.exit(1)
+
+def run_render(args, overrides):
+    if overrides:
+        raise SystemExit("--render plays the game's own constants; drop the overrides")
+    sessions = [recorded for files in session_files(args.logs) for recorded in read_sessions(files)]
+    if len(sessions) != 1:
+        raise SystemExit(f"--render needs the logs of exactly one session, got {len(sessions)}")
+    frames = render_session(sessions[0], args.render, args.frames)
+    print(f"render: {frames} frames of session {sessions[0].session}", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.replay", description="Replay recorded sessions.")
+    parser.add_argument("logs", nargs="+", help="telemetry log files or directories of them")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="worker processes")
+    parser.add_argument("--recorded-moves", action="store_true",
+                        help="take the opponent moves from the logs instead of replaying the strategies")
+    parser.add_argument("--output", default=None, help="write every session's replay as JSON Lines")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any session changed")
+    parser.add_argument("--render", type=float, default=None, metavar="SPEED",
+                        help="play one session in the game window at SPEED times real time")
+    parser.add_argument("--frames", default=None, metavar="DIR", help="with --render, save every frame to DIR")
+    for name in PARAMETERS:
+        parser.add_argument("--" + name.replace("_", "-"), dest=name, type=float, default=None,
+                            help=f"replay with a different {name}")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+    if args.render is not None and args.render <= 0:
+        raise SystemExit("--render speed must be positive")
+    if args.frames is not None and args.render is None:
+        raise SystemExit("--frames needs --render")
+
+    overrides = {name: getattr(args, name) for name in PARAMETERS if getattr(args, name) is not None}
+    try:
+        if args.render is not None:
+            run_render(args, overrides)
+        else:
+            run_replay(args, overrides)
+    except ValueError as error:
+        raise SystemExit(str(error))
+
+if __name__ == "__main__":
+    main()
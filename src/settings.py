@@ -5,6 +5,25 @@ class Settings:
     screen_height = 600
     fps = 60
 
+    # print the bytes of off-screen surfaces allocated by each frame
+    debug_allocations = False
+
+    # show the frame-time overlay at startup (F3 toggles it)
+    show_hud = False
+
+    # pack the character sprites into one atlas surface at startup
+    sprite_atlas = False
+
+    # directory for the session telemetry log (JSON Lines), None to disable
+    telemetry_dir = None
+
+    # seed of the opponents' random moves in the 1v1 mode, None for a new
+    # one every session (it is logged with the session telemetry)
+    session_seed = None
+
+    # seed of the league simulation; its results are cached on disk per seed
+    league_seed = 0
+
     strategies = [
         "cautious",
         "unpredictable",
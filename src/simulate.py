@@ -0,0 +1,209 @@
+# src/simulate.py
+#
+# Headless batch entry point, next to main.py for the GUI:
+#
+#   python -m src.simulate league --rounds 1000 --copies 200 --workers 8 --output league.npy
+#   python -m src.simulate sweep --samples 100000 --life-weight 0 1 --output sweep/
+#   python -m src.simulate montecarlo --repetitions 1000 --seed 7 --output montecarlo.npz
+#   python -m src.simulate evolve moran --population 100 --generations 1000000 --output moran.npy
+#
+# Every command prints its throughput when it finishes.
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from src.cache import cached_payoffs
+from src.engine import Engine
+from src.evolution import DEFAULT_SELECTION, ranking, run_moran, run_replicator
+from src.montecarlo import DEFAULT_BATCH_ROWS, run_monte_carlo
+from src.parallel import DEFAULT_TILE_SIZE, default_workers, play_tournament_parallel
+from src.settings import Settings
+from src.strategies import STRATEGY_IDS, get_strategy
+from src.sweep import PARAMETERS, random_samples, run_sweep
+from src.tournament import random_seed, to_league_results
+
+def make_engine(args):
+    strategies = []
+    for name in args.strategies.split(","):
+        name = name.strip()
+        if name not in STRATEGY_IDS:
+            raise SystemExit(f"unknown strategy {name!r}, choose from: {', '.join(STRATEGY_IDS)}")
+        strategies.append(STRATEGY_IDS[name])
+    return Engine(num_rounds=args.rounds, strategies=strategies * args.copies)
+
+def report(label, count, unit, elapsed):
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{label}: {count} {unit} in {elapsed:.3f}s ({rate:,.0f} {unit}/sec)", file=sys.stderr)
+
+# total payoff of every player against the others, best first
+def print_ranking(engine, payoffs, limit=10):
+    totals = payoffs.sum(axis=1) - np.diag(payoffs)
+    for rank, player in enumerate(np.argsort(-totals, kind="stable")[:limit]):
+        name = get_strategy(int(engine.strategies[player])).name
+        print(f"{rank + 1:>3}. {name} (player {player}): {totals[player]:.1f}")
+
+def save_matrix(path, payoffs):
+    if path.endswith(".json"):
+        with open(path, "w") as output:
+            json.dump(to_league_results(payoffs), output)
+    else:
+        np.save(path, payoffs)
+
+def run_league(args):
+    engine = make_engine(args)
+    if args.seed is not None:
+        seed = args.seed
+    elif args.cache:
+        # a random seed would write a cache entry nobody ever reads again
+        seed = Settings.league_seed
+    else:
+        seed = random_seed()
+    num_players = len(engine.strategies)
+    num_matches = num_players * (num_players + 1) // 2
+
+    start = time.perf_counter()
+    if args.cache:
+        payoffs = np.asarray(cached_payoffs(engine, seed, workers=args.workers, tile_size=args.tile_size))
+    else:
+        payoffs = play_tournament_parallel(engine, seed, args.workers, args.tile_size).payoffs()
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        save_matrix(args.output, payoffs)
+    print_ranking(engine, payoffs)
+    print(f"seed: {seed}", file=sys.stderr)
+    report("league", num_matches, "matches", elapsed)
+    report("league", num_matches * engine.num_rounds, "rounds", elapsed)
+
+def run_sweep_command(args):
+    engine = make_engine(args)
+    seed = random_seed() if args.seed is None else args.seed
+    ranges = {name: tuple(getattr(args, name)) for name in PARAMETERS if getattr(args, name) is not None}
+    samples = random_samples(args.samples, ranges, engine, seed)
+
+    start = time.perf_counter()
+    result = play_tournament_parallel(engine, seed, args.workers, args.tile_size)
+    league_elapsed = time.perf_counter() - start
+    columns = run_sweep(samples, engine, result=result, output=args.output, keep_scores=not args.no_scores)
+    elapsed = time.perf_counter() - start
+
+    if columns is not None:
+        winners = np.bincount(columns["winner"], minlength=len(engine.strategies))
+        for player in np.flatnonzero(winners):
+            name = get_strategy(int(engine.strategies[player])).name
+            print(f"{name} (player {player}) wins {winners[player]} of {args.samples} samples")
+    print(f"seed: {seed}", file=sys.stderr)
+    num_players = len(engine.strategies)
+    report("league", num_players * (num_players + 1) // 2, "matches", league_elapsed)
+    report("sweep", args.samples, "samples", elapsed)
+
+def run_monte_carlo_command(args):
+    engine = make_engine(args)
+    seed = random_seed() if args.seed is None else args.seed
+
+    start = time.perf_counter()
+    result = run_monte_carlo(engine, args.repetitions, seed, args.confidence, args.batch_rows, args.workers)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        np.savez(args.output, mean=result.mean, std=result.std, samples=result.samples,
+                 ci_low=result.ci_low(), ci_high=result.ci_high())
+    print_ranking(engine, result.mean)
+    print(f"seed: {seed}", file=sys.stderr)
+    # the upper triangle holds one entry per pairing
+    report("montecarlo", int(np.triu(result.samples).sum()), "matches", elapsed)
+
+def run_evolve(args):
+    if args.generations < 1 or args.record_every < 1 or args.population < 2:
+        raise SystemExit("--generations and --record-every must be at least 1, --population at least 2")
+    engine = make_engine(args)
+    # the league comes from the on-disk cache, so repeated runs skip it
+    payoffs = np.asarray(cached_payoffs(engine, args.league_seed))
+
+    start = time.perf_counter()
+    if args.dynamics == "replicator":
+        trajectory = run_replicator(payoffs, args.generations, selection=args.selection,
+                                    record_every=args.record_every)
+    else:
+        trajectory = run_moran(payoffs, args.population, args.generations, selection=args.selection,
+                               mutation=args.mutation, seed=args.seed, record_every=args.record_every)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        np.save(args.output, trajectory)
+    final = trajectory[-1] / trajectory[-1].sum()
+    for rank, player in enumerate(ranking(final)[:10]):
+        name = get_strategy(int(engine.strategies[player])).name
+        print(f"{rank + 1:>3}. {name} (player {player}): {final[player]:.3f}")
+    report(args.dynamics, args.generations, "generations", elapsed)
+
+# tiles=False for commands that don't split the league into tiles
+def add_common_arguments(parser, tiles=True):
+    parser.add_argument("--strategies", default=",".join(Settings.strategies),
+                        help="comma separated strategy names (default: the league personas)")
+    parser.add_argument("--copies", type=int, default=1, help="repeat the strategy list this many times")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per match")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random moves")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="worker processes")
+    if tiles:
+        parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE, help="players per side of a worker tile")
+    parser.add_argument("--output", default=None, help="where to write the results")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.simulate", description="Headless league simulations.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    league = commands.add_parser("league", help="play a round-robin league (--output .npy or .json)")
+    add_common_arguments(league)
+    league.add_argument("--cache", action="store_true",
+                        help="read and fill the on-disk league cache (seed defaults to the game's league seed)")
+    league.set_defaults(run=run_league)
+
+    sweep = commands.add_parser("sweep", help="random sweep of payoff weights and damage (--output directory)")
+    add_common_arguments(sweep)
+    sweep.add_argument("--samples", type=int, default=1000, help="number of parameter samples")
+    sweep.add_argument("--no-scores", action="store_true", help="only keep the winner of every sample")
+    for name in PARAMETERS:
+        sweep.add_argument("--" + name.replace("_", "-"), dest=name, type=float, nargs=2,
+                           metavar=("LOW", "HIGH"), help=f"sample {name} uniformly from LOW to HIGH")
+    sweep.set_defaults(run=run_sweep_command)
+
+    montecarlo = commands.add_parser("montecarlo", help="repeat stochastic pairings (--output .npz)")
+    add_common_arguments(montecarlo, tiles=False)
+    montecarlo.add_argument("--repetitions", type=int, default=100, help="matches per stochastic pairing")
+    montecarlo.add_argument("--confidence", type=float, default=0.95, help="confidence level of the intervals")
+    montecarlo.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS,
+                            help="matches per worker batch")
+    montecarlo.set_defaults(run=run_monte_carlo_command)
+
+    evolve = commands.add_parser("evolve", help="population dynamics over the cached league (--output .npy)")
+    evolve.add_argument("dynamics", choices=("replicator", "moran"), help="replicator shares or a finite Moran population")
+    evolve.add_argument("--strategies", default=",".join(Settings.strategies),
+                        help="comma separated strategy names (default: the league personas)")
+    evolve.add_argument("--copies", type=int, default=1, help="repeat the strategy list this many times")
+    evolve.add_argument("--rounds", type=int, default=5, help="rounds per match")
+    evolve.add_argument("--league-seed", type=int, default=Settings.league_seed, help="seed of the cached league")
+    evolve.add_argument("--seed", type=int, default=None, help="seed of the Moran process")
+    evolve.add_argument("--generations", type=int, default=1000, help="number of generations")
+    evolve.add_argument("--selection", type=float, default=DEFAULT_SELECTION, help="selection strength")
+    evolve.add_argument("--population", type=int, default=100, help="Moran population size")
+    evolve.add_argument("--mutation", type=float, default=0.0, help="Moran mutation probability")
+    evolve.add_argument("--record-every", type=int, default=1, help="keep every n-th generation")
+    evolve.add_argument("--output", default=None, help="where to write the trajectory")
+    evolve.set_defaults(run=run_evolve, workers=1)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.copies < 1 or args.rounds < 1 or args.workers < 1:
+        raise SystemExit("--copies, --rounds and --workers must be at least 1")
+    if getattr(args, "tile_size", 1) < 1 or getattr(args, "batch_rows", 1) < 1:
+        raise SystemExit("--tile-size and --batch-rows must be at least 1")
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# src/strategies.py
+#
+# Strategy registry. Every strategy is a class registered with
+# @register_strategy; its id is its index in STRATEGIES, so dispatch is a
+# list lookup. Memory-one strategies also declare a transition table that
+# compile_tables turns into an array the batch simulator reads directly.
+import random
+
+import numpy as np
+
+# index = strategy id
+STRATEGIES = []
+# strategy name -> strategy id
+STRATEGY_IDS = {}
+
+def register_strategy(cls):
+    if cls.name in STRATEGY_IDS:
+        raise ValueError(f"Strategy {cls.name!r} is already registered")
+    cls.id = len(STRATEGIES)
+    STRATEGIES.append(cls)
+    STRATEGY_IDS[cls.name] = cls.id
+    return cls
+
+def get_strategy(strategy):
+    if isinstance(strategy, str):
+        if strategy not in STRATEGY_IDS:
+            raise ValueError(f"Unknown strategy {strategy!r}")
+        return STRATEGIES[STRATEGY_IDS[strategy]]
+    if not (0 <= strategy < len(STRATEGIES)):
+        raise ValueError(f"Invalid strategy id {strategy!r}")
+    return STRATEGIES[strategy]
+
+def make_strategy(strategy, rng=random):
+    return get_strategy(strategy)(rng)
+
+# Stateful strategies: each keeps a small fixed-size state and is updated
+# with one (opponent_choice, own_choice) round at a time.
+# 1 - use ; 0 - not use
+class Strategy:
+    name = None
+    label = None
+    # number of past rounds the strategy looks at
+    memory = 0
+    # whether choose() draws from rng; memory-one strategies work it out
+    # from their table
+    stochastic = False
+
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.reset()
+
+    # forget the match so far
+    def reset(self):
+        pass
+
+    def choose(self):
+        raise NotImplementedError
+
+    def update(self, opponent_choice, own_choice):
+        pass
+
+# Strategies that only look at the last round. first_move is the probability
+# of using AWs in round one, transitions[own_last][opponent_last] the
+# probability of using AWs afterwards.
+class MemoryOneStrategy(Strategy):
+    memory = 1
+    first_move = 0.0
+    transitions = ((0.0, 0.0), (0.0, 0.0))
+
+    def reset(self):
+        self.last = None
+
+    def choose(self):
+        if(self.last is None):
+            p = self.first_move
+        else:
+            p = self.transitions[self.last[0]][self.last[1]]
+        if p <= 0:
+            return 0
+        if p >= 1:
+            return 1
+        return int(self.rng.random() < p)
+
+    def update(self, opponent_choice, own_choice):
+        self.last = (own_choice, opponent_choice)
+
+def is_stochastic(strategy):
+    cls = get_strategy(strategy)
+    if issubclass(cls, MemoryOneStrategy):
+        probabilities = [cls.first_move] + [p for row in cls.transitions for p in row]
+        return any(0 < p < 1 for p in probabilities)
+    return cls.stochastic
+
+# Table layout of compile_tables: column 0 is the first move, column
+# 1 + 2 * own_last + opponent_last the move after that round.
+NUM_TABLE_STATES = 5
+
+def is_compiled(strategy):
+    return issubclass(get_strategy(strategy), MemoryOneStrategy)
+
+# (strategies, 5) float64 probabilities of using AWs per state; strategies
+# that are not memory-one get a row of NaN and have to be played as objects
+def compile_tables(strategies=None):
+    if strategies is None:
+        strategies = range(len(STRATEGIES))
+    tables = np.full((len(strategies), NUM_TABLE_STATES), np.nan)
+    for i, strategy in enumerate(strategies):
+        cls = get_strategy(int(strategy))
+        if issubclass(cls, MemoryOneStrategy):
+            tables[i, 0] = cls.first_move
+            for own in range(2):
+                for opponent in range(2):
+                    tables[i, 1 + 2 * own + opponent] = cls.transitions[own][opponent]
+    return tables
+
+# Given the game so far and the strategy in use, make the choice
+# past_rounds holds (opponent_choice, own_choice) tuples
+def get_computer_choice(strategy, past_rounds, rng=random):
+    if not (0 <= strategy < len(STRATEGIES)):
+        return -1
+    player = STRATEGIES[strategy](rng)
+    for opponent_choice, own_choice in past_rounds:
+        player.update(opponent_choice, own_choice)
+    return player.choose()
+
+# The league personas keep ids 0-4, register new strategies after them.
+
+@register_strategy
+class Cautious(MemoryOneStrategy): # Developed Country
+    # choose to either cooperate or defect on what the opponent chose to do in the last round
+    name = "cautious"
+    label = "Cautious"
+    first_move = 0.5
+    transitions = ((0.0, 1.0), (0.0, 1.0))
+
+@register_strategy
+class Unpredictable(MemoryOneStrategy): # Developing Country
+    # alternate between cooperate and defect based on their perceived needs and resources
+    name = "unpredictable"
+    label = "Unpredictable"
+    first_move = 0.0
+    transitions = ((1.0, 1.0), (0.0, 0.0))
+
+@register_strategy
+class Defensive(MemoryOneStrategy): # Resource-rich Country
+    # cooperate until the opponent defects once, then defect for good (grim trigger)
+    name = "defensive"
+    label = "Defensive"
+    first_move = 0.0
+    transitions = ((0.0, 1.0), (1.0, 1.0))
+
+@register_strategy
+class Aggressive(MemoryOneStrategy): # Military-focused Country
+    # choose to defect most of the time
+    name = "aggressive"
+    label = "Aggressive"
+    first_move = 1.0
+    transitions = ((1.0, 1.0), (1.0, 1.0))
+
+@register_strategy
+class Cooperative(MemoryOneStrategy): # Peace-focused Country
+    # choose to cooperate most of the time
+    name = "cooperative"
+    label = "Cooperative"
+    first_move = 0.0
+    transitions = ((0.0, 0.0), (0.0, 0.0))
+
+@register_strategy
+class Pavlov(MemoryOneStrategy):
+    # win-stay, lose-shift: keep the last move if both sides matched, switch otherwise
+    name = "pavlov"
+    label = "Pavlov"
+    first_move = 0.0
+    transitions = ((0.0, 1.0), (1.0, 0.0))
+
+@register_strategy
+class GenerousTitForTat(MemoryOneStrategy):
+    # copy the opponent, but forgive a use of AWs one time in three
+    name = "generous"
+    label = "Generous"
+    first_move = 0.0
+    transitions = ((0.0, 2 / 3), (0.0, 2 / 3))
+
+@register_strategy
+class CoinFlip(MemoryOneStrategy):
+    # flip a coin every round
+    name = "random"
+    label = "Random"
+    first_move = 0.5
+    transitions = ((0.5, 0.5), (0.5, 0.5))
+
+@register_strategy
+class TitForTwoTats(Strategy):
+    # only retaliate after the opponent used AWs two rounds in a row
+    name = "tit_for_two_tats"
+    label = "Tit for Two Tats"
+    memory = 2
+
+    def reset(self):
+        self.opponent_streak = 0
+
+    def choose(self):
+        return int(self.opponent_streak >= 2)
+
+    def update(self, opponent_choice, own_choice):
+        if opponent_choice:
+            self.opponent_streak = min(self.opponent_streak + 1, 2)
+        else:
+            self.opponent_streak = 0
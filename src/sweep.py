@@ -0,0 +1,102 @@
+# src/sweep.py
+#
+# Parameter sweeps over the payoff weights and damage constants. Strategies
+# never look at payoffs, so the league is played once and every sample only
+# re-weighs its outcome tallies. Payoffs are linear in the damage constants
+# and in the weights, so each sample's per-strategy totals are a weighted sum
+# of six precomputed vectors (3 damage constants x 2 weights).
+import itertools
+
+import numpy as np
+
+from src.columnar import ColumnWriter
+from src.engine import Engine
+from src.tournament import play_tournament
+
+PARAMETERS = ("life_weight", "resource_weight", "min_damage", "mid_damage", "max_damage")
+DAMAGE_PARAMETERS = ("min_damage", "mid_damage", "max_damage")
+WEIGHT_PARAMETERS = ("life_weight", "resource_weight")
+
+DEFAULT_CHUNK_SIZE = 65536
+
+# every combination of the given values; parameters that are left out keep
+# the engine's value
+def parameter_grid(engine=None, **values):
+    engine = engine or Engine()
+    for name in values:
+        if name not in PARAMETERS:
+            raise ValueError(f"Unknown sweep parameter {name!r}")
+    axes = [np.atleast_1d(values.get(name, getattr(engine, name))) for name in PARAMETERS]
+    combos = np.array(list(itertools.product(*axes)), dtype=np.float64).reshape(-1, len(PARAMETERS))
+    return {name: combos[:, i] for i, name in enumerate(PARAMETERS)}
+
+# num_samples uniform draws; ranges maps parameter -> (low, high)
+def random_samples(num_samples, ranges, engine=None, seed=None):
+    engine = engine or Engine()
+    for name in ranges:
+        if name not in PARAMETERS:
+            raise ValueError(f"Unknown sweep parameter {name!r}")
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for name in PARAMETERS:
+        if name in ranges:
+            low, high = ranges[name]
+            samples[name] = rng.uniform(low, high, num_samples)
+        else:
+            samples[name] = np.full(num_samples, float(getattr(engine, name)))
+    return samples
+
+# (3 damage constants, 2 weights, N) total payoff of every strategy against
+# the others (self-play left out, like the payoff page) when only that damage
+# constant is 1 and only that weight is 1
+def score_basis(result):
+    engine = result.engine
+    basis = np.empty((len(DAMAGE_PARAMETERS), len(WEIGHT_PARAMETERS), len(result.strategies)))
+    for d, damage in enumerate(DAMAGE_PARAMETERS):
+        for w, weight in enumerate(WEIGHT_PARAMETERS):
+            unit = {name: 0 for name in PARAMETERS}
+            unit[damage] = 1
+            unit[weight] = 1
+            unit_engine = Engine(num_rounds=engine.num_rounds, strategies=engine.strategies, **unit)
+            payoffs = result.payoffs(unit_engine)
+            basis[d, w] = payoffs.sum(axis=1) - np.diag(payoffs)
+    return basis
+
+# (samples, N) total payoff of every strategy for each sample
+def sample_scores(basis, samples):
+    damage = np.stack([np.asarray(samples[name], dtype=np.float64) for name in DAMAGE_PARAMETERS], axis=1)
+    weight = np.stack([np.asarray(samples[name], dtype=np.float64) for name in WEIGHT_PARAMETERS], axis=1)
+    return np.einsum("sd,sw,dwn->sn", damage, weight, basis)
+
+# Evaluate every sample. Rows are streamed to output (a columnar directory)
+# chunk by chunk when given, otherwise returned as one dict of columns.
+# Columns: the parameters, winner (strategy index with the best total
+# payoff), winner_score and, with keep_scores, scores (samples, N).
+def run_sweep(samples, engine=None, seed=None, result=None, output=None,
+              chunk_size=DEFAULT_CHUNK_SIZE, keep_scores=True):
+    engine = engine or Engine()
+    result = result or play_tournament(engine, seed)
+    basis = score_basis(result)
+
+    num_samples = len(samples[PARAMETERS[0]])
+    writer = ColumnWriter(output) if output else None
+    chunks = []
+    try:
+        for start in range(0, num_samples, chunk_size):
+            chunk = {name: np.asarray(samples[name][start:start + chunk_size], dtype=np.float64) for name in PARAMETERS}
+            scores = sample_scores(basis, chunk)
+            chunk["winner"] = scores.argmax(axis=1).astype(np.int32)
+            chunk["winner_score"] = scores.max(axis=1)
+            if keep_scores:
+                chunk["scores"] = scores
+            if writer:
+                writer.append(chunk)
+            else:
+                chunks.append(chunk)
+    finally:
+        if writer:
+            writer.close()
+
+    if writer or not chunks:
+        return None
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
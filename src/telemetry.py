@@ -0,0 +1,138 @@
+# src/telemetry.py
+#
+# Append-only session log in JSON Lines. The game loop only puts events on a
+# queue; a background thread encodes them, writes them in batches, fsyncs at
+# most every sync_interval seconds and starts a new file once the current
+# one reaches max_bytes. Files are named <session>-<part>.jsonl so a
+# directory shared by many kiosks can be aggregated without collisions:
+#
+#   {"t": 12.345, "session": "...", "seq": 7, "event": "round", "match": 0, ...}
+#
+# If the disk falls behind and the queue fills up, events are dropped and
+# counted instead of blocking a frame; so is an event that can't be encoded.
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+
+# one event per line; bump when fields change meaning
+TELEMETRY_VERSION = 1
+
+_CLOSE = object()
+
+def new_session_id():
+    return time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:8]
+
+class TelemetryWriter:
+    def __init__(self, directory, session=None, max_bytes=16 * 2**20, sync_interval=1.0, max_queue=10000):
+        self.directory = directory
+        self.session = session or new_session_id()
+        self.max_bytes = max_bytes
+        self.sync_interval = sync_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.started = time.perf_counter()
+        self.seq = 0
+        self.dropped = 0
+        # events dropped by the writer thread because they couldn't be encoded
+        self.invalid = 0
+        self.written = 0
+        self.part = 0
+        self.file = None
+        self.size = 0
+        self.error = None
+        os.makedirs(directory, exist_ok=True)
+        self.log("session_start", version=TELEMETRY_VERSION)
+        self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def path(self, part):
+        return os.path.join(self.directory, f"{self.session}-{part:04d}.jsonl")
+
+    # queue one event; never blocks, fields must be JSON serializable
+    def log(self, event, **fields):
+        record = {"t": round(time.perf_counter() - self.started, 6), "session": self.session,
+                  "seq": self.seq, "event": event}
+        record.update(fields)
+        self.seq += 1
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    # flush everything queued so far and stop the writer thread
+    def close(self):
+        if not self.thread.is_alive():
+            return
+        self.queue.put(_CLOSE)
+        self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        self.file = open(self.path(self.part), "ab")
+        self.size = self.file.tell()
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _write(self, records):
+        written = 0
+        for record in records:
+            try:
+                line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+            except (TypeError, ValueError):
+                # e.g. a numpy integer field; one bad event must not stop the log
+                self.invalid += 1
+                continue
+            if self.size and self.size + len(line) > self.max_bytes:
+                self._sync()
+                self.file.close()
+                self.part += 1
+                self._open()
+            self.file.write(line)
+            self.size += len(line)
+            written += 1
+        self.written += written
+
+    def _run(self):
+        try:
+            self._open()
+            last_sync = time.monotonic()
+            unsynced = False
+            closing = False
+            while not closing:
+                # block for the first event, then take whatever else is queued
+                try:
+                    records = [self.queue.get(timeout=self.sync_interval)]
+                except queue.Empty:
+                    records = []
+                while True:
+                    try:
+                        records.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if _CLOSE in records:
+                    closing = True
+                    records = [record for record in records if record is not _CLOSE]
+                if records:
+                    self._write(records)
+                    self.file.flush()
+                    unsynced = True
+                # fsync in batches, not per event
+                if unsynced and (closing or time.monotonic() - last_sync >= self.sync_interval):
+                    self._sync()
+                    last_sync = time.monotonic()
+                    unsynced = False
+        except OSError as error:
+            # telemetry must not take the game down; keep the error for the caller
+            self.error = error
+        finally:
+            if self.file is not None:
+                self.file.close()
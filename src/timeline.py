@@ -0,0 +1,77 @@
+# src/timeline.py
+#
+# Non-blocking scheduler for timed effects. The game loop advances it by the
+# clock's frame delta; delays, tweens and repeating tasks run their callbacks
+# from there instead of sleeping or spinning, so events keep being handled
+# while an effect plays. Times are in milliseconds, like pygame's clock.
+
+class Task:
+    def __init__(self, start, duration, on_update=None, on_done=None, interval=None):
+        self.start = start
+        self.duration = duration
+        self.on_update = on_update
+        self.on_done = on_done
+        # repeating tasks fire every interval until cancelled
+        self.interval = interval
+        self.cancelled = False
+        self.finished = False
+
+    def progress(self, now):
+        if self.duration <= 0:
+            return 1.0
+        return min(max((now - self.start) / self.duration, 0.0), 1.0)
+
+    def cancel(self):
+        self.cancelled = True
+
+class Timeline:
+    def __init__(self):
+        self.now = 0
+        self.tasks = []
+
+    def _add(self, task):
+        self.tasks.append(task)
+        return task
+
+    # call callback() once, delay ms from now
+    def after(self, delay, callback):
+        return self._add(Task(self.now, delay, on_done=callback))
+
+    # call on_update(progress) every frame for duration ms with progress going
+    # from 0 to 1, then on_done()
+    def tween(self, duration, on_update, on_done=None):
+        return self._add(Task(self.now, duration, on_update=on_update, on_done=on_done))
+
+    # call callback() every interval ms until the task is cancelled
+    def every(self, interval, callback):
+        return self._add(Task(self.now, interval, on_done=callback, interval=interval))
+
+    def busy(self):
+        return any(not task.cancelled for task in self.tasks)
+
+    def cancel_all(self):
+        for task in self.tasks:
+            task.cancel()
+
+    # advance by dt ms; callbacks may schedule new tasks, which start counting
+    # from the new time
+    def update(self, dt):
+        self.now += dt
+        for task in list(self.tasks):
+            if task.cancelled:
+                continue
+
+            if task.interval is not None:
+                while not task.cancelled and self.now - task.start >= task.interval:
+                    task.start += task.interval
+                    task.on_done()
+                continue
+
+            progress = task.progress(self.now)
+            if task.on_update:
+                task.on_update(progress)
+            if progress >= 1.0 and not task.cancelled:
+                task.finished = True
+                if task.on_done:
+                    task.on_done()
+        self.tasks = [task for task in self.tasks if not task.cancelled and not task.finished]
@@ -0,0 +1,256 @@
+# src/tournament.py
+#
+# Batched round-robin evaluator. Every pairing of the league is played at the
+# same time: memory-one strategies are read from their compiled tables, so a
+# round of all pairs is a handful of array operations instead of a Python
+# loop per pair. Other strategies fall back to playing their objects.
+import random
+
+import numpy as np
+
+from src.engine import Engine, MASK64, mix64
+from src.strategies import STRATEGIES, compile_tables, make_strategy
+
+# outcome index of a round = 2 * p1_choice + p2_choice
+NUM_OUTCOMES = 4
+
+# (4 outcomes, 4 fields) table of (p1_lives, p1_resources, p2_lives, p2_resources)
+def damage_table(engine):
+    return np.array([engine.damage(outcome >> 1, outcome & 1) for outcome in range(NUM_OUTCOMES)], dtype=np.float64)
+
+# every (p1, p2) with p1 <= p2, in the order the league loop visits them
+def league_pairs(num_players):
+    p1, p2 = np.triu_indices(num_players)
+    return p1.astype(np.intp), p2.astype(np.intp)
+
+# engine.mix64 for uint64 arrays, wraps around on overflow
+def mix64_array(x):
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+# engine.pair_seed for arrays of pairs
+def pair_seeds(seed, p1, p2):
+    seed = np.uint64(mix64(seed & MASK64))
+    return mix64_array(mix64_array(seed ^ p1.astype(np.uint64)) ^ p2.astype(np.uint64))
+
+# (pairs,) uniforms in [0, 1) for one side of one round, fixed by (pair seed, round, side)
+def round_uniforms(seeds, r, side):
+    bits = mix64_array(seeds ^ np.uint64(mix64(2 * r + side)))
+    return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+# (N, N) matrix with p1_values at [p1, p2] and p2_values at [p2, p1]
+def pair_matrix(num_players, p1, p2, p1_values, p2_values):
+    matrix = np.empty((num_players, num_players), dtype=np.float64)
+    matrix[p1, p2] = p1_values
+    # p2 is written last so self-play matches keep the p2 payoff, like the league loop
+    matrix[p2, p1] = p2_values
+    return matrix
+
+# (pairs,) payoffs of both sides from (pairs, 4) outcome tallies
+def pair_payoffs(engine, outcome_counts):
+    totals = outcome_counts @ damage_table(engine)
+    p1_payoff = engine.life_weight * totals[:, 0] + engine.resource_weight * totals[:, 1]
+    p2_payoff = engine.life_weight * totals[:, 2] + engine.resource_weight * totals[:, 3]
+    return p1_payoff, p2_payoff
+
+class TournamentResult:
+    def __init__(self, engine, p1, p2, outcome_counts, histories=None):
+        self.engine = engine
+        self.strategies = np.asarray(engine.strategies)
+        self.p1 = p1
+        self.p2 = p2
+        # (pairs, 4) number of rounds that ended in each outcome
+        self.outcome_counts = outcome_counts
+        # (pairs, rounds, 2) uint8 choices of p1 and p2, if kept
+        self.histories = histories
+
+    # (pairs, 4) totals of (p1_lives, p1_resources, p2_lives, p2_resources)
+    def totals(self, engine=None):
+        engine = engine or self.engine
+        return self.outcome_counts @ damage_table(engine)
+
+    def _to_matrix(self, p1_values, p2_values):
+        return pair_matrix(len(self.strategies), self.p1, self.p2, p1_values, p2_values)
+
+    def lives(self, engine=None):
+        totals = self.totals(engine)
+        return self._to_matrix(totals[:, 0], totals[:, 2])
+
+    def resources(self, engine=None):
+        totals = self.totals(engine)
+        return self._to_matrix(totals[:, 1], totals[:, 3])
+
+    # payoffs[i][j] = strategies[i] payoff in strategies[i] vs strategies[j]
+    def payoffs(self, engine=None):
+        return self._to_matrix(*pair_payoffs(engine or self.engine, self.outcome_counts))
+
+# p1 and p2 index into strategies; the random moves only depend on
+# (seed, p1, p2), so any split of the pairs gives the same results
+def play_pairs(strategies, p1, p2, num_rounds, seed=None, keep_history=False):
+    if seed is None:
+        seed = random_seed()
+    return play_seeded(strategies, p1, p2, pair_seeds(seed, p1, p2), num_rounds, keep_history)
+
+# like play_pairs, with the uint64 seed of every pair given directly
+def play_seeded(strategies, p1, p2, seeds, num_rounds, keep_history=False):
+    strategies = np.asarray(strategies, dtype=np.intp)
+    if np.any((strategies < 0) | (strategies >= len(STRATEGIES))):
+        raise ValueError("Invalid strategy id for play_pairs")
+
+    num_pairs = len(p1)
+    outcome_counts = np.zeros((num_pairs, NUM_OUTCOMES), dtype=np.int64)
+    histories = np.zeros((num_pairs, num_rounds, 2), dtype=np.uint8) if keep_history else None
+
+    # memory-one strategies run from their tables, anything else as objects
+    tables = compile_tables()
+    compiled = ~np.isnan(tables).any(axis=1)
+    fast = compiled[strategies[p1]] & compiled[strategies[p2]]
+
+    if fast.any():
+        counts, fast_histories = play_compiled(tables, strategies[p1[fast]], strategies[p2[fast]],
+                                               seeds[fast], num_rounds, keep_history)
+        outcome_counts[fast] = counts
+        if keep_history:
+            histories[fast] = fast_histories
+
+    for k in np.flatnonzero(~fast):
+        history = histories[k] if keep_history else None
+        outcome_counts[k] = play_objects(strategies[p1[k]], strategies[p2[k]], num_rounds,
+                                         random.Random(int(seeds[k])), history)
+
+    return outcome_counts, histories
+
+# table column p2 reads for each joint state, which is p1's column with
+# own and opponent moves swapped
+P2_COLUMNS = [0, 1, 3, 2, 4]
+
+# Once the first round is played, a pair of deterministic memory-one
+# strategies is a map from the last outcome (4 values) to the next one, so
+# the outcomes repeat from round 4 on with a period dividing 12.
+PERIOD_START = 4
+PERIOD = 12
+
+def is_random(table):
+    return (table > 0) & (table < 1)
+
+# pairs of memory-one strategies, looked up in their compiled tables
+def play_compiled(tables, s1, s2, seeds, num_rounds, keep_history=False):
+    num_pairs = len(s1)
+    t1 = tables[s1]
+    t2 = tables[s2][:, P2_COLUMNS]
+
+    outcome_counts = np.zeros((num_pairs, NUM_OUTCOMES), dtype=np.int64)
+    histories = np.zeros((num_pairs, num_rounds, 2), dtype=np.uint8) if keep_history else None
+
+    random_later = (is_random(t1[:, 1:]) | is_random(t2[:, 1:])).any(axis=1)
+    for play, pairs in ((play_periodic, ~random_later), (play_rounds, random_later)):
+        if not pairs.any():
+            continue
+        counts, pair_histories = play(t1[pairs], t2[pairs], seeds[pairs], num_rounds, keep_history)
+        outcome_counts[pairs] = counts
+        if keep_history:
+            histories[pairs] = pair_histories
+    return outcome_counts, histories
+
+# pairs that are deterministic after the first round: play until the
+# outcomes repeat, then count the rest of the match from the period
+def play_periodic(t1, t2, seeds, num_rounds, keep_history=False):
+    num_played = min(num_rounds, PERIOD_START + PERIOD)
+    _, played = play_rounds(t1, t2, seeds, num_played, keep_history=True)
+
+    outcomes = 2 * played[:, :, 0] + played[:, :, 1]
+    one_hot = (outcomes[:, :, None] == np.arange(NUM_OUTCOMES)).astype(np.int64)
+    outcome_counts = one_hot.sum(axis=1)
+
+    remaining = num_rounds - num_played
+    if remaining > 0:
+        outcome_counts += (remaining // PERIOD) * one_hot[:, PERIOD_START:].sum(axis=1)
+        outcome_counts += one_hot[:, PERIOD_START:PERIOD_START + remaining % PERIOD].sum(axis=1)
+
+    histories = None
+    if keep_history:
+        rounds = np.arange(num_rounds)
+        rounds[num_played:] = PERIOD_START + (rounds[num_played:] - PERIOD_START) % PERIOD
+        histories = played[:, rounds]
+    return outcome_counts, histories
+
+# Round by round: both sides read the same joint state, 0 in the first
+# round and 1 + outcome of the last round afterwards.
+def play_rounds(t1, t2, seeds, num_rounds, keep_history=False):
+    num_pairs, num_states = t1.shape
+    random_first = (is_random(t1[:, 0]) | is_random(t2[:, 0])).any()
+    random_later = (is_random(t1[:, 1:]) | is_random(t2[:, 1:])).any()
+    t1 = t1.ravel()
+    t2 = t2.ravel()
+    base = np.arange(num_pairs, dtype=np.intp) * num_states
+
+    histories = np.zeros((num_pairs, num_rounds, 2), dtype=np.uint8) if keep_history else None
+
+    index = base
+    # rounds in which p1 used AWs, p2 used AWs, both used AWs
+    p1_uses = np.zeros(num_pairs, dtype=np.int64)
+    p2_uses = np.zeros(num_pairs, dtype=np.int64)
+    both_use = np.zeros(num_pairs, dtype=np.int64)
+
+    for r in range(num_rounds):
+        p1_prob = t1[index]
+        p2_prob = t2[index]
+        if (random_first if r == 0 else random_later):
+            p1_choice = (round_uniforms(seeds, r, 0) < p1_prob).view(np.uint8)
+            p2_choice = (round_uniforms(seeds, r, 1) < p2_prob).view(np.uint8)
+        else:
+            p1_choice = (p1_prob > 0.5).view(np.uint8)
+            p2_choice = (p2_prob > 0.5).view(np.uint8)
+
+        p1_uses += p1_choice
+        p2_uses += p2_choice
+        both_use += p1_choice & p2_choice
+        if keep_history:
+            histories[:, r, 0] = p1_choice
+            histories[:, r, 1] = p2_choice
+
+        index = base + 1 + 2 * p1_choice + p2_choice
+
+    # (pairs, 4) rounds per outcome, indexed by 2 * p1_choice + p2_choice
+    outcome_counts = np.stack([
+        num_rounds - p1_uses - p2_uses + both_use,
+        p2_uses - both_use,
+        p1_uses - both_use,
+        both_use,
+    ], axis=1)
+    return outcome_counts, histories
+
+# one pair with at least one strategy that has no table
+def play_objects(s1, s2, num_rounds, rng, history=None):
+    p1_strategy = make_strategy(int(s1), rng)
+    p2_strategy = make_strategy(int(s2), rng)
+    outcome_counts = np.zeros(NUM_OUTCOMES, dtype=np.int64)
+    for r in range(num_rounds):
+        p1_choice = p1_strategy.choose()
+        p2_choice = p2_strategy.choose()
+        outcome_counts[2 * p1_choice + p2_choice] += 1
+        if history is not None:
+            history[r] = (p1_choice, p2_choice)
+        p1_strategy.update(p2_choice, p1_choice)
+        p2_strategy.update(p1_choice, p2_choice)
+    return outcome_counts
+
+def random_seed():
+    return int(np.random.SeedSequence().generate_state(1, dtype=np.uint64)[0])
+
+# play every pairing of engine.strategies at once
+def play_tournament(engine=None, seed=None, keep_history=False):
+    engine = engine or Engine()
+    p1, p2 = league_pairs(len(engine.strategies))
+    outcome_counts, histories = play_pairs(engine.strategies, p1, p2, engine.num_rounds, seed, keep_history)
+    return TournamentResult(engine, p1, p2, outcome_counts, histories)
+
+# (N, N) float64 payoff matrix of a league_results dict-of-lists
+def league_matrix(league_results):
+    return np.array([league_results[i] for i in range(len(league_results))], dtype=np.float64)
+
+# league_results dict-of-lists as run_league_simulation builds it
+def to_league_results(matrix):
+    return {i: [float(value) for value in row] for i, row in enumerate(matrix)}
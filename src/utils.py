@@ -1,11 +1,178 @@
 # src/utils.py
 import pygame
 import random
-import math
+import functools
+from collections import OrderedDict
 
+import numpy as np
+
+from src.fonts import fonts
 from src.settings import Settings
 
 settings = Settings()
+rng = np.random.default_rng()
+
+# Reusable off-screen surfaces. Widgets ask for a cleared surface by layer
+# and size instead of allocating a new one on every draw. A surface is only
+# valid until the next request for the same layer and size, so callers blit
+# it right away. Allocation counters show how many bytes each frame cost.
+class SurfacePool:
+    def __init__(self):
+        self.surfaces = {}
+        self.frame = 0
+        self.frame_bytes = 0
+        self.last_frame_bytes = 0
+        self.peak_frame_bytes = 0
+        self.total_bytes = 0
+        self.allocations = 0
+        self.requests = 0
+
+    # call once per frame, before anything is drawn
+    def begin_frame(self):
+        self.last_frame_bytes = self.frame_bytes
+        self.peak_frame_bytes = max(self.peak_frame_bytes, self.frame_bytes)
+        self.frame_bytes = 0
+        self.frame += 1
+
+    # flags=0 gives an opaque surface, e.g. for snapshots of the screen
+    def get(self, layer, size, fill=(0, 0, 0, 0), flags=pygame.SRCALPHA):
+        size = (int(size[0]), int(size[1]))
+        self.requests += 1
+        key = (layer, size, flags)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, flags)
+            self.surfaces[key] = surface
+            nbytes = surface.get_pitch() * size[1]
+            self.frame_bytes += nbytes
+            self.total_bytes += nbytes
+            self.allocations += 1
+        surface.fill(fill)
+        return surface
+
+    def pooled_bytes(self):
+        return sum(surface.get_pitch() * surface.get_height() for surface in self.surfaces.values())
+
+    def stats(self):
+        return {
+            "frame": self.frame,
+            "last_frame_bytes": self.last_frame_bytes,
+            "peak_frame_bytes": max(self.peak_frame_bytes, self.frame_bytes),
+            "total_bytes": self.total_bytes,
+            "allocations": self.allocations,
+            "requests": self.requests,
+            "pooled_bytes": self.pooled_bytes(),
+        }
+
+# the pool the widgets draw with; Game installs its own with set_surface_pool
+surface_pool = SurfacePool()
+
+def set_surface_pool(pool):
+    global surface_pool
+    surface_pool = pool
+
+# LRU cache of rendered text keyed by font, string, antialias and colors.
+# Most strings on screen never change, so drawing them costs a blit instead of
+# a FreeType rasterization. Cached surfaces are shared: blit them, never draw
+# on them.
+class TextCache:
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        key = (font, text, antialias, tuple(color), None if background is None else tuple(background))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        return {
+            "entries": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+text_cache = TextCache()
+# the cached surfaces are keyed by fonts, which die with the font module
+fonts.on_clear.append(text_cache.clear)
+
+# drop-in for font.render(text, antialias, color, background)
+def render_text(font, text, antialias, color, background=None):
+    return text_cache.render(font, text, antialias, color, background)
+
+# Regions of the screen that changed since the last frame was pushed. Widgets
+# add their rect when what they draw changes (hover, fading, moving particles),
+# the game invalidates the whole screen on clicks and scene changes. A frame
+# is only redrawn when something changed or is still animating, and only the
+# changed regions are pushed with display.update(rects).
+class DirtyRects:
+    # past this many rects a single bounding rect is cheaper to push
+    max_rects = 16
+
+    def __init__(self, bounds):
+        self.bounds = pygame.Rect(bounds)
+        self.rects = []
+        self.full = True
+        self.awake = True
+
+    def add(self, rect):
+        rect = pygame.Rect(rect).clip(self.bounds)
+        if rect.width > 0 and rect.height > 0:
+            self.rects.append(rect)
+
+    # the whole screen changed
+    def invalidate(self):
+        self.full = True
+
+    # something may have changed (e.g. the mouse moved), so run the draw pass
+    def wake(self):
+        self.awake = True
+
+    def needs_draw(self):
+        return self.full or self.awake or len(self.rects) > 0
+
+    # rects to push this frame; anything that reported a change keeps the
+    # next frame awake, so animations run until they stop reporting
+    def flush(self):
+        if self.full:
+            rects = [self.bounds]
+        elif len(self.rects) > self.max_rects:
+            rects = [self.rects[0].unionall(self.rects[1:])]
+        else:
+            rects = self.rects
+        self.awake = len(self.rects) > 0
+        self.rects = []
+        self.full = False
+        return rects
+
+# the tracker the widgets report to; Game installs its own with set_dirty_rects
+dirty_rects = DirtyRects((0, 0, settings.screen_width, settings.screen_height))
+
+def set_dirty_rects(tracker):
+    global dirty_rects
+    dirty_rects = tracker
+
+# report a changed region to the installed tracker
+def mark_dirty(rect):
+    dirty_rects.add(rect)
 
 class Button:
     def __init__(self, text, x, y, width, height, color, hover_color, font):
@@ -18,20 +185,25 @@ class Button:
         self.hover_color = hover_color
         self.font = font
         self.text_color = (0,0,0)
+        self.drawn_state = None
 
     def draw(self, screen, mouse_x, mouse_y):
-        button_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        button_surface.fill((0, 0, 0, 0))
+        button_surface = surface_pool.get("button", (self.width, self.height))
 
         if self.x < mouse_x < self.x + self.width and self.y < mouse_y < self.y + self.height:
             color = self.hover_color
         else:
             color = self.color
 
+        state = (color, self.text, self.text_color, self.x, self.y, self.width, self.height)
+        if state != self.drawn_state:
+            dirty_rects.add((self.x, self.y, self.width + 1, self.height + 1))
+            self.drawn_state = state
+
         pygame.draw.rect(button_surface, color, pygame.Rect(0, 0, self.width, self.height))
         screen.blit(button_surface, (self.x, self.y))
 
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = render_text(self.font, self.text, True, self.text_color)
         text_rect = text_surface.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2))
         screen.blit(text_surface, text_rect)
 
@@ -70,8 +242,7 @@ class InfoPanel:
     def draw(self, screen, mouse_x, mouse_y):
 
         # Draw the panel
-        panel_surface = pygame.Surface((self.panel_width, self.panel_height), pygame.SRCALPHA)
-        panel_surface.fill(self.panel_color)
+        panel_surface = surface_pool.get("panel", (self.panel_width, self.panel_height), self.panel_color)
 
         pygame.draw.rect(panel_surface, self.panel_color, pygame.Rect(0, 0, self.panel_width, self.panel_width))
         screen.blit(panel_surface, (self.panel_x, self.panel_y))
@@ -79,12 +250,12 @@ class InfoPanel:
         # Draw the panel text
         text_y = self.panel_y + 30
         for i, line in enumerate(self.main_text):
-            text_surface = self.font.render(line, True, (0, 0, 0))
+            text_surface = render_text(self.font, line, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=(settings.screen_width // 2, text_y))
             screen.blit(text_surface, text_rect)
             text_y += 30
 
-        # main_text_surface = self.font.render(self.main_text, True, (0, 0, 0))
+        # main_text_surface = render_text(self.font, self.main_text, True, (0, 0, 0))
         # main_text_rect = main_text_surface.get_rect(center=(self.panel_x + self.panel_width // 2, self.panel_y + self.panel_height // 2))
         # screen.blit(main_text_surface, main_text_rect)
 
@@ -107,74 +278,147 @@ def translate(value, leftMin, leftMax, rightMin, rightMax):
     # Convert the 0-1 range into a value in the right range.
     return rightMin + (valueScaled * rightSpan)
 
-class SmokeParticle:
-    def __init__(self, color):
-        self.active = True
-        self.x = random.randint(0, settings.screen_width)
-        self.y = settings.screen_height + random.randint(50, 200)
-        self.radius = random.randint(3, 10)
-
+# Checkerboard swipe geometry for one resolution, computed once: the center
+# of every square, the cell size and the progress at which each square
+# starts to change (squares further along the diagonal start later).
+@functools.lru_cache(maxsize=4)
+def swipe_geometry(width, height, ysize=10):
+    ratio = round(width/height)
+    xsize = round(ysize * ratio)
+    i, j = np.meshgrid(np.arange(xsize), np.arange(ysize), indexing="ij")
+    # add 0.5 because the pos will be the center of the checkerboard squares
+    centers_x = ((i + 0.5) / xsize * width).ravel()
+    centers_y = ((j + 0.5) / ysize * height).ravel()
+    offsets = (((i + j) / ((xsize - 1) + (ysize - 1))) / 2).ravel()
+    for array in (centers_x, centers_y, offsets):
+        array.setflags(write=False)
+    return centers_x, centers_y, offsets, round(width/xsize), round(height/ysize)
+
+# (x, y, w, h) of every square at progress; each square grows from nothing to
+# 1.1 cells (or shrinks back) over half of the transition
+def swipe_rects(width, height, progress, growing):
+    centers_x, centers_y, offsets, cell_width, cell_height = swipe_geometry(width, height)
+    # same arithmetic as translate(progress, offset, offset+0.5, start, end)
+    start, end = (0, 1.1) if growing else (1.1, 0)
+    scaled = (progress - offsets) / ((offsets + 0.5) - offsets)
+    amount = np.where(progress > offsets + 0.5, end,
+                      np.where(progress > offsets, start + scaled * (end - start), start))
+    widths = amount * cell_width
+    heights = amount * cell_height
+    return np.stack([centers_x - widths/2, centers_y - heights/2, widths, heights], axis=1).astype(np.int64)
+
+# Struct-of-arrays particle storage. Every attribute lives in a preallocated
+# NumPy array, a frame updates all particles with vectorized math, and dead
+# particles are dropped in one masked pass.
+class ParticleSystem:
+    fields = ("x", "y", "vel_x", "vel_y", "radius", "decay_counter", "decay_rate",
+              "tick_counter", "tick_rate", "amplitude", "wobble_rate")
+
+    def __init__(self, capacity, color, outline=0):
+        self.capacity = capacity
         self.color = color
-
-        self.rise_speed = random.randint(1, 3)
-        self.decay_rate = random.uniform(0.01, 0.03)/10
-        self.tick_rate = random.randint(1, 5)
-        self.tick_counter = 0
-        self.decay_counter = 1
-        self.amplitude = random.randint(1, 5)
-        self.wobble_rate = random.uniform(0.1, 0.2)
-        
-
-    def draw(self, surface):
-        self.decay_counter -= self.decay_rate
-        if((self.decay_counter <= 0) or (self.y < (self.radius * -1))):
-            self.active = False
+        # 0 draws filled circles, otherwise the outline is round(outline*decay) + 1 wide
+        self.outline = outline
+        self.count = 0
+        self.bounds = None
+        for field in self.fields:
+            setattr(self, field, np.zeros(capacity))
+
+    # add up to n particles; values maps field -> scalar or array of n values
+    def spawn(self, n, **values):
+        n = min(n, self.capacity - self.count)
+        if n <= 0:
             return
+        end = self.count + n
+        for field in self.fields:
+            getattr(self, field)[self.count:end] = values.get(field, 0)
+        self.decay_counter[self.count:end] = values.get("decay_counter", 1)
+        self.count = end
+
+    def _compact(self, alive):
+        self.count = int(alive.sum())
+        for field in self.fields:
+            array = getattr(self, field)
+            array[:self.count] = array[:len(alive)][alive]
+
+    # draws the next frame and returns the screen region that changed: where
+    # the particles were last frame and where they are now (None if neither)
+    def update_and_draw(self, surface):
+        previous, self.bounds = self.bounds, None
+        n = self.count
+        if n == 0:
+            return previous
+        x, y = self.x[:n], self.y[:n]
+        decay_counter, decay_rate = self.decay_counter[:n], self.decay_rate[:n]
+        tick_counter = self.tick_counter[:n]
+
+        decay_counter -= decay_rate
+        alive = (decay_counter > 0) & (y >= -self.radius[:n])
+        if not alive.all():
+            self._compact(alive)
+            n = self.count
+            if n == 0:
+                return previous
+            x, y = self.x[:n], self.y[:n]
+            decay_counter, decay_rate = self.decay_counter[:n], self.decay_rate[:n]
+            tick_counter = self.tick_counter[:n]
+
+        # Calculate the new position of the particles
+        x += self.vel_x[:n]
+        y += self.vel_y[:n]
+        draw_x = x + np.sin((tick_counter/20) * self.wobble_rate[:n]) * (self.amplitude[:n] * (tick_counter/50))
+
+        # Calculate the new radius and transparency of the particles
+        radius = self.radius[:n] + tick_counter/20
+        alpha = np.clip(255 * decay_counter, 0, 255).astype(np.int32)
+        if self.outline:
+            width = np.round(self.outline * decay_counter).astype(np.int32) + 1
+        else:
+            width = np.zeros(n, dtype=np.int32)
 
-        # Calculate the new position of the particle
-        curr_x = self.x + math.sin((self.tick_counter/20) * self.wobble_rate) * (self.amplitude * (self.tick_counter/50))
-        self.y -= self.rise_speed
-
-        # Calculate the new radius and transparency of the particle
-        radius = self.radius + self.tick_counter/20
-        alpha = 255 * self.decay_counter
+        # Draw the particles on the surface
+        r, g, b = self.color[0], self.color[1], self.color[2]
+        for px, py, pr, pa, pw in zip(draw_x.tolist(), y.tolist(), radius.tolist(), alpha.tolist(), width.tolist()):
+            pygame.draw.circle(surface, (r, g, b, pa), (px, py), pr, pw)
 
-        # Draw the particle on the surface
-        color = (self.color[0], self.color[1], self.color[2], alpha)
-        pygame.draw.circle(surface, color, (curr_x, self.y), radius)
+        # Update the particles' tick counters and decay
+        tick_counter += self.tick_rate[:n]
+        decay_counter -= decay_rate
 
-        # Update the particle's tick counter and amplitude
-        self.tick_counter += self.tick_rate
-        self.decay_counter -= self.decay_rate
+        left = int(np.floor((draw_x - radius).min())) - 1
+        top = int(np.floor((y - radius).min())) - 1
+        right = int(np.ceil((draw_x + radius).max())) + 2
+        bottom = int(np.ceil((y + radius).max())) + 2
+        self.bounds = pygame.Rect(left, top, right - left, bottom - top)
+        return self.bounds if previous is None else self.bounds.union(previous)
 
 class SmokeBackground:
     def __init__(self, max_particles, particle_color):
         self.max_particles = max_particles
         self.color = particle_color
+        self.particles = ParticleSystem(max_particles, particle_color)
+        self.spawn(max_particles)
+
+    def spawn(self, n):
+        self.particles.spawn(n,
+            x=rng.integers(0, settings.screen_width, n, endpoint=True),
+            y=settings.screen_height + rng.integers(50, 200, n, endpoint=True),
+            radius=rng.integers(3, 10, n, endpoint=True),
+            vel_y=-rng.integers(1, 3, n, endpoint=True),
+            decay_rate=rng.uniform(0.01, 0.03, n)/10,
+            tick_rate=rng.integers(1, 5, n, endpoint=True),
+            amplitude=rng.integers(1, 5, n, endpoint=True),
+            wobble_rate=rng.uniform(0.1, 0.2, n))
 
-        self.particles = []
-        for i in range(max_particles):
-            new_particle = SmokeParticle(self.color)
-            self.particles.append(new_particle)
-    
     def draw(self, screen):
-        if(len(self.particles) < self.max_particles):
+        if(self.particles.count < self.max_particles):
             if(random.randint(0, 30) < 2):
-                new_particle = SmokeParticle(self.color)
-                self.particles.append(new_particle)
-
-        smoke_surface = pygame.Surface((settings.screen_width, settings.screen_height), pygame.SRCALPHA)
-
-        if(len(self.particles) > 0):
-            i = 0
-            while(i < len(self.particles)):
-                particle = self.particles[i]
-                if(particle.active):
-                    particle.draw(smoke_surface)
-                    i += 1
-                else:
-                    del self.particles[i]
-                    i -= 1
+                self.spawn(1)
+
+        smoke_surface = surface_pool.get("smoke", (settings.screen_width, settings.screen_height))
+        changed = self.particles.update_and_draw(smoke_surface)
+        if changed:
+            dirty_rects.add(changed)
 
         # pygame.draw.rect(smoke_surface, (255, 255, 255), pygame.Rect(0, 0, settings.screen_width, settings.screen_height))
         screen.blit(smoke_surface, (0, 0))
@@ -186,9 +430,15 @@ class NavArrowLeft:
         self.y = settings.screen_height - 1.5*size
         self.color = (200, 200, 200)
         self.hover_color = (225, 225, 225)
+        self.drawn_hover = None
 
     def draw(self, screen, mouse_x, mouse_y):
-        if(self.is_hover(mouse_x, mouse_y)):
+        hover = self.is_hover(mouse_x, mouse_y)
+        if hover != self.drawn_hover:
+            dirty_rects.add((self.x, self.y, self.size + 1, self.size + 1))
+            self.drawn_hover = hover
+
+        if(hover):
             pygame.draw.polygon(screen, self.hover_color, [(self.x, self.y + self.size/2), (self.x + self.size, self.y), (self.x + self.size, self.y + self.size)])
         else:
             pygame.draw.polygon(screen, self.color, [(self.x, self.y + self.size/2), (self.x + self.size, self.y), (self.x + self.size, self.y + self.size)])
@@ -203,9 +453,15 @@ class NavArrowRight:
         self.y = settings.screen_height - 1.5*size
         self.color = (200, 200, 200)
         self.hover_color = (225, 225, 225)
+        self.drawn_hover = None
 
     def draw(self, screen, mouse_x, mouse_y):
-        if(self.is_hover(mouse_x, mouse_y)):
+        hover = self.is_hover(mouse_x, mouse_y)
+        if hover != self.drawn_hover:
+            dirty_rects.add((self.x, self.y, self.size + 1, self.size + 1))
+            self.drawn_hover = hover
+
+        if(hover):
             pygame.draw.polygon(screen, self.hover_color, [(self.x, self.y), (self.x + self.size, self.y + self.size/2), (self.x, self.y + self.size)])
         else:
             pygame.draw.polygon(screen, self.color, [(self.x, self.y), (self.x + self.size, self.y + self.size/2), (self.x, self.y + self.size)])
@@ -214,86 +470,37 @@ class NavArrowRight:
         return self.x <= mouse_x <= self.x + self.size and self.y <= mouse_y <= self.y + self.size
 
 
-class ExplodeParticle:
-    def __init__(self, pos, color):
-        self.active = True
-        self.x = pos[0]
-        self.y = pos[1]
-
-        vel_x = random.randint(1, 3)
-        if((random.randint(0,100)%2)): vel_x = vel_x * -1
-        vel_y = random.randint(1, 3)
-        if((random.randint(0,100)%2)): vel_y = vel_y * -1
-
-        self.vel_x = vel_x
-        self.vel_y = vel_y
-        
-        self.radius = random.randint(3, 10)
-        self.thickness = 5
-
-        self.color = color
-
-        # self.rise_speed = random.randint(1, 3)
-        self.decay_rate = random.uniform(0.01, 0.03)/3
-        self.tick_rate = random.randint(1, 5)
-        self.tick_counter = 0
-        self.decay_counter = 1
-        # self.amplitude = random.randint(1, 5)
-        # self.wobble_rate = random.uniform(0.1, 0.2)
-        
-
-    def draw(self, surface):
-        self.decay_counter -= self.decay_rate
-        if((self.decay_counter <= 0) or (self.y < (self.radius * -1))):
-            self.active = False
-            return
-
-        # Calculate the new position of the particle
-        self.x += self.vel_x
-        self.y += self.vel_y
-
-        # Calculate the new radius and transparency of the particle
-        radius = self.radius + self.tick_counter/20
-        alpha = 255 * self.decay_counter
-
-        # Draw the particle on the surface
-        color = (self.color[0], self.color[1], self.color[2], alpha)
-        pygame.draw.circle(surface, color, (self.x, self.y), radius, round(self.thickness*self.decay_counter) + 1)
-
-        # Update the particle's tick counter and amplitude
-        self.tick_counter += self.tick_rate
-        self.decay_counter -= self.decay_rate
-
 class ExplodeEffect:
     def __init__(self, pos, max_particles, particle_color):
         self.active = True
         self.max_particles = max_particles
         self.color = particle_color
-        self.particles = []
-        for i in range(max_particles):
-            new_particle = ExplodeParticle(pos, self.color)
-            self.particles.append(new_particle)
-    
+        self.particles = ParticleSystem(max_particles, particle_color, outline=5)
+
+        n = max_particles
+        sign_x = np.where(rng.integers(0, 100, n, endpoint=True) % 2, -1, 1)
+        sign_y = np.where(rng.integers(0, 100, n, endpoint=True) % 2, -1, 1)
+        self.particles.spawn(n,
+            x=pos[0],
+            y=pos[1],
+            vel_x=rng.integers(1, 3, n, endpoint=True) * sign_x,
+            vel_y=rng.integers(1, 3, n, endpoint=True) * sign_y,
+            radius=rng.integers(3, 10, n, endpoint=True),
+            decay_rate=rng.uniform(0.01, 0.03, n)/3,
+            tick_rate=rng.integers(1, 5, n, endpoint=True))
+
     def draw(self, screen):
-        if(len(self.particles) == 0):
+        if(self.particles.count == 0):
             self.active = False
+            # clear where the last particles were drawn
+            if self.particles.bounds:
+                dirty_rects.add(self.particles.bounds)
+            return
 
-        explode_surface = pygame.Surface((settings.screen_width, settings.screen_height), pygame.SRCALPHA)
-
-        if(len(self.particles) > 0):
-            i = 0
-            while(i < len(self.particles)):
-                try:
-                    particle = self.particles[i]
-                    if(particle.active):
-                        particle.draw(explode_surface)
-                        i += 1
-                    else:
-                        del self.particles[i]
-                        i -= 1
-                except:
-                    self.active = False
-                    return
+        explode_surface = surface_pool.get("explode", (settings.screen_width, settings.screen_height))
+        changed = self.particles.update_and_draw(explode_surface)
+        if changed:
+            dirty_rects.add(changed)
 
         # pygame.draw.rect(smoke_surface, (255, 255, 255), pygame.Rect(0, 0, settings.screen_width, settings.screen_height))
         screen.blit(explode_surface, (0, 0))
@@ -304,7 +511,6 @@ class AlertPanel:
         self.active = True
         self.created = pygame.time.get_ticks()
         self.active_time = 2000
-        self.fade_time = 1000
         self.fade_duration = 1000
 
         self.text = text
@@ -324,28 +530,70 @@ class AlertPanel:
 
     def draw(self, screen):
 
+        # fully visible for active_time ms, then fades out over fade_duration ms
+        age = pygame.time.get_ticks() - self.created
         alpha = 1
-        if self.active_time > 0:
-            self.active_time -= (pygame.time.get_ticks() - self.created)
-        elif self.fade_time > 0:
-            self.fade_time -= (pygame.time.get_ticks() - self.created)
-            alpha = (self.fade_time/self.fade_duration)
-        
-        if alpha < 0 or self.fade_time < 0: 
+        if age > self.active_time:
+            alpha = 1 - (age - self.active_time)/self.fade_duration
+
+        # the panel may be fading, and disappearing clears its area
+        dirty_rects.add((self.x, self.y, self.width + 1, self.height + 1))
+        if alpha < 0:
             self.active = False
             return
         else:
             alpha = round(alpha*255)
 
-        
         color = (self.color[0], self.color[1], self.color[2], alpha)
 
-        alert_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        alert_surface.fill((0, 0, 0, 0))
+        alert_surface = surface_pool.get("alert", (self.width, self.height))
         pygame.draw.rect(alert_surface, color, pygame.Rect(0, 0, self.width, self.height))
         screen.blit(alert_surface, (self.x, self.y))
 
         text_color = (self.text_color[0], self.text_color[1], self.text_color[2], alpha)
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = render_text(self.font, self.text, True, text_color)
         text_rect = text_surface.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2))
         screen.blit(text_surface, text_rect)
+
+# Performance overlay in the top-right corner: fps and p50/p99 frame and draw
+# times of the current scene, plus the surface bytes allocated in its window.
+# The text refreshes every refresh ms so it stays readable.
+class PerformanceHud:
+    def __init__(self, profiler, font, refresh=500):
+        self.profiler = profiler
+        self.font = font
+        self.refresh = refresh
+        self.updated = None
+        self.lines = []
+        self.line_height = font.get_linesize()
+        self.width = 300
+
+    def update_lines(self, scene):
+        summary = self.profiler.summary(scene)
+        if summary is None:
+            return [str(scene)]
+        return [
+            f"{scene}: {summary['fps']:.1f} fps",
+            f"frame p50 {summary['frame_p50_ms']:.1f} p99 {summary['frame_p99_ms']:.1f} ms",
+            f"draw p50 {summary['draw_p50_ms']:.1f} p99 {summary['draw_p99_ms']:.1f} ms",
+            f"alloc {summary['alloc_bytes']} B, text misses {summary['text_misses']}",
+        ]
+
+    def draw(self, screen, scene):
+        now = pygame.time.get_ticks()
+        if self.updated is None or now - self.updated >= self.refresh:
+            lines = self.update_lines(scene)
+            self.updated = now
+            if lines != self.lines:
+                self.lines = lines
+                mark_dirty(self.rect())
+
+        rect = self.rect()
+        hud_surface = surface_pool.get("hud", rect.size, (0, 0, 0, 170))
+        for i, line in enumerate(self.lines):
+            hud_surface.blit(render_text(self.font, line, True, (255, 255, 255)), (6, 4 + i * self.line_height))
+        screen.blit(hud_surface, rect)
+
+    def rect(self):
+        height = 8 + self.line_height * max(len(self.lines), 1)
+        return pygame.Rect(settings.screen_width - self.width, 0, self.width, height)
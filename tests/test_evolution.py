@@ -0,0 +1,21 @@
+# tests/test_evolution.py
+import numpy as np
+
+from src.evolution import run_moran
+
+# exp(selection * payoff) of payoffs this large underflows to 0, the fitness
+# must be taken relative to the fittest strategy
+def test_moran_large_payoffs():
+    payoffs = np.array([[-1e6, -2e6], [-3e6, -1e6]])
+    trajectory = run_moran(payoffs, 10, 1000, seed=1)
+    assert trajectory.shape == (1001, 2)
+    assert (trajectory.sum(axis=1) == 10).all()
+    # strategy 0 loses less against everybody and takes over
+    assert trajectory[-1].tolist() == [10, 0]
+
+def test_moran_large_payoffs_with_mutation():
+    rng = np.random.default_rng(0)
+    payoffs = -rng.uniform(1e5, 1e7, (6, 6))
+    trajectory = run_moran(payoffs, 50, 5000, selection=1.0, mutation=0.05, seed=2, record_every=10)
+    assert (trajectory.sum(axis=1) == 50).all()
+    assert (trajectory >= 0).all()
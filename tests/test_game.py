@@ -0,0 +1,37 @@
+# tests/test_game.py
+#
+# The game under SDL's dummy video driver, driven frame by frame without
+# input.
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import pytest
+
+from src.game import Game
+
+@pytest.fixture
+def game():
+    pygame.init()
+    yield Game(seed=0)
+    pygame.quit()
+
+# every frame of a swipe transition draws, not only those with input
+def test_transition_draws_every_frame(game, monkeypatch):
+    calls = []
+    draw_transition = game.draw_transition
+    monkeypatch.setattr(game, "draw_transition", lambda: calls.append(draw_transition()))
+
+    game.frame(16)
+    game.swipe_transition(game.current_scene + 1)
+    frames = 0
+    while game.transition is not None:
+        game.frame(16)
+        frames += 1
+        assert frames < 200
+    # the frame that ends the transition draws the new scene instead
+    assert frames > 60
+    assert len(calls) == frames - 1
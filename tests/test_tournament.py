@@ -0,0 +1,40 @@
+# tests/test_tournament.py
+#
+# The vectorized evaluator against Engine.run_league_simulation, and the
+# process-pool mode against the serial one. Only deterministic strategies can
+# be compared with the engine: both draw their random moves differently.
+import numpy as np
+import pytest
+
+from src.engine import Engine
+from src.parallel import play_tournament_parallel
+from src.strategies import STRATEGIES, is_stochastic
+from src.tournament import league_matrix, play_tournament
+
+DETERMINISTIC = [strategy for strategy in range(len(STRATEGIES)) if not is_stochastic(strategy)]
+
+def make_engine(num_rounds, copies=1):
+    return Engine(num_rounds=num_rounds, strategies=DETERMINISTIC * copies)
+
+def test_has_deterministic_strategies():
+    assert len(DETERMINISTIC) > 1
+
+@pytest.mark.parametrize("num_rounds", [1, 5, 17, 1001])
+def test_tournament_matches_league_simulation(num_rounds):
+    engine = make_engine(num_rounds)
+    expected = league_matrix(engine.run_league_simulation(seed=11))
+    np.testing.assert_array_equal(play_tournament(engine, 11).payoffs(), expected)
+
+@pytest.mark.parametrize("workers, tile_size", [(1, 1), (1, 256), (2, 3), (3, 7), (4, 16)])
+def test_parallel_matches_serial(workers, tile_size):
+    engine = make_engine(17, copies=4)
+    expected = play_tournament(engine, 5)
+    result = play_tournament_parallel(engine, 5, workers, tile_size)
+    np.testing.assert_array_equal(result.payoffs(), expected.payoffs())
+
+# with stochastic strategies too the tiles must replay the same per-pair seeds
+def test_parallel_matches_serial_stochastic():
+    engine = Engine(num_rounds=9, strategies=list(range(len(STRATEGIES))) * 3)
+    expected = play_tournament(engine, 23)
+    result = play_tournament_parallel(engine, 23, workers=2, tile_size=5)
+    np.testing.assert_array_equal(result.payoffs(), expected.payoffs())